@@ -0,0 +1,164 @@
+"""Benchmarks for the data_processing and calendar hot paths on synthetic accounts.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_data_processing                     # compare against baselines
+    python -m benchmarks.bench_data_processing --update-baseline   # record new baselines
+    python -m benchmarks.bench_data_processing --sizes 10k,100k,1m,10m
+
+Each path is timed (best of several runs) and its peak traced memory recorded at
+every size. The run exits with status 1 when any path is slower or uses more
+memory than its baseline by more than --threshold (time also by at least
+--min-delta seconds), and with status 2 when
+any result has no baseline to compare against. benchmarks/baselines.json
+holds the committed baselines for the default sizes (10k, 100k and 1m).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('MT5_BACKEND', 'synthetic')
+
+import pandas as pd
+from utils.synthetic_deals import generate_deals
+from utils.data_processing import prepare_deals_frame, get_daily_stats, calculate_trading_metrics, calculate_monthly_stats
+from utils.metrics_cache import clear_cache
+from utils.rollup import build_rollup
+from utils.calendar_renderer import render_calendar_html
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+# Sizes run by default and covered by the committed baselines; 10m is opt-in
+DEFAULT_SIZES = ('10k', '100k', '1m')
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this are scheduler noise on millisecond paths, whatever their ratio
+DEFAULT_MIN_DELTA = 0.005
+# Memory is measured on one call; timing repeats scale down as inputs grow
+REPEATS = {10_000: 7, 100_000: 5, 1_000_000: 3, 10_000_000: 1}
+# Fast paths keep repeating until this much time is sampled, so sub-millisecond timings are stable
+MIN_SAMPLE_SECONDS = 0.2
+
+def synthetic_frame(n_deals, seed=42):
+    """Builds a dashboard deal frame of n_deals rows from the synthetic generator."""
+    columns = generate_deals(n_deals, seed=seed)
+    columns.pop('is_open')
+    return prepare_deals_frame(pd.DataFrame(columns))
+
+def _cases(deals_df):
+    daily_stats = get_daily_stats(deals_df)
+    last_day = daily_stats['Date'].max()
+    year, month = last_day.year, last_day.month
+    def daily_stats_uncached():
+        # get_daily_stats reads the rollup through the fingerprint cache; time the build, not a hit
+        clear_cache()
+        return get_daily_stats(deals_df)
+    return {
+        'build_rollup': lambda: build_rollup(deals_df),
+        'get_daily_stats': daily_stats_uncached,
+        'calculate_trading_metrics': lambda: calculate_trading_metrics(deals_df),
+        'calculate_monthly_stats': lambda: calculate_monthly_stats(daily_stats, year, month),
+        'render_calendar_html': lambda: render_calendar_html(daily_stats, year, month),
+    }
+
+def measure(func, repeats):
+    """Returns (best wall time in seconds, peak traced memory in MB) for func."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = float('inf')
+    sampled = 0.0
+    runs = 0
+    while runs < repeats or sampled < MIN_SAMPLE_SECONDS:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        sampled += elapsed
+        runs += 1
+    return best, peak / 2**20
+
+def run(sizes):
+    results = {}
+    for label in sizes:
+        n_deals = SIZES[label]
+        deals_df = synthetic_frame(n_deals)
+        for name, func in _cases(deals_df).items():
+            seconds, peak_mb = measure(func, REPEATS[n_deals])
+            results[f"{name}@{label}"] = {'time_s': seconds, 'peak_mb': peak_mb}
+            print(f"{name:<28}{label:>6}{seconds * 1000:>12.2f} ms{peak_mb:>12.1f} MB", flush=True)
+        del deals_df
+    return results
+
+def compare(results, baselines, threshold, min_delta=DEFAULT_MIN_DELTA):
+    """Returns (human-readable regressions against the stored baselines, result keys with no baseline).
+
+    A time counts as a regression only when it is both more than threshold
+    slower and at least min_delta seconds slower than its baseline.
+    """
+    regressions, missing = [], []
+    for key, current in results.items():
+        base = baselines.get(key)
+        if base is None:
+            missing.append(key)
+            continue
+        for field, unit, floor in (('time_s', 's', min_delta), ('peak_mb', 'MB', 0)):
+            if base[field] > 0 and current[field] > max(base[field] * (1 + threshold), base[field] + floor):
+                change = (current[field] / base[field] - 1) * 100
+                regressions.append(f"{key} {field}: {base[field]:.4g}{unit} -> {current[field]:.4g}{unit} (+{change:.0f}%)")
+    return regressions, missing
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help='comma-separated subset of ' + ', '.join(SIZES))
+    parser.add_argument('--update-baseline', '--save', dest='save', action='store_true', help='store the results as the new baselines')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed relative regression (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA, help='smallest slowdown in seconds that counts as a regression')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file')
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip().lower() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    results = run(sizes)
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    if args.save:
+        stored.setdefault('results', {}).update(results)
+        stored['machine'] = {'python': platform.python_version(), 'platform': platform.platform(), 'pandas': pd.__version__}
+        with open(args.baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if not stored:
+        print(f"No baselines at {args.baseline}; run with --update-baseline to record them.")
+        return 2
+
+    regressions, missing = compare(results, stored.get('results', {}), args.threshold, args.min_delta)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    if missing:
+        print(f"\nNo baseline in {args.baseline} for:")
+        for key in missing:
+            print(f"  {key}")
+        print("Run with --update-baseline to record them.")
+        return 2
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
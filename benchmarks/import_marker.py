@@ -0,0 +1 @@
+"""Marks the end of harness imports in benchmarks.import_time profiles."""
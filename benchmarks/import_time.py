@@ -0,0 +1,110 @@
+"""Cold-start import profile of the dashboard's login screen and pages, from `python -X importtime`.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time                          # login screen and every page
+    python -m benchmarks.import_time --pages Login,Calendar --top 10
+
+Each screen is rendered once with Streamlit's AppTest in a fresh interpreter
+started with -X importtime, on the synthetic MT5 backend. Streamlit and the
+test harness are imported before a marker module, so the report only counts
+what the app itself pulls in: the wall time of the first run (first paint),
+the number of modules imported and the slowest top-level imports by
+cumulative time.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from pages import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGIN = 'Login'
+DEFAULT_TOP = 8
+# Marker import separating harness imports from the app's own
+_MARKER = 'benchmarks.import_marker'
+
+_RUNNER = f'''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+import {_MARKER}
+page = sys.argv[1]
+at = AppTest.from_file('main.py', default_timeout=300)
+if page != {LOGIN!r}:
+    from utils.mt5_backend import mt5
+    mt5.initialize(); mt5.login(1, 'x', 'Synthetic')
+    at.session_state.logged_in = True
+    at.session_state.account_info = mt5.account_info()
+    at.session_state.current_page = page
+start = time.perf_counter()
+at.run()
+print(json.dumps({{'seconds': time.perf_counter() - start, 'exceptions': [e.value for e in at.exception]}}))
+'''
+
+def _parse_importtime(stderr):
+    """(module, self us, cumulative us, depth) rows logged after the marker import."""
+    rows = []
+    seen_marker = False
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue
+        module = name.strip()
+        if module == _MARKER:
+            seen_marker = True
+            continue
+        if seen_marker:
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((module, int(self_us), int(cumulative_us), depth))
+    return rows
+
+def profile(page):
+    """Renders one screen in a fresh interpreter and returns its first-paint time and import profile."""
+    env = dict(os.environ, MT5_BACKEND=os.environ.get('MT5_BACKEND', 'synthetic'))
+    env.setdefault('MT5_SYNTHETIC_DEALS', '20000')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _RUNNER, page],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page}: {proc.stderr.strip().splitlines()[-1]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = _parse_importtime(proc.stderr)
+    top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: row[2], reverse=True)
+    return {
+        'page': page,
+        'first_run': result['seconds'],
+        'exceptions': result['exceptions'],
+        'modules': len(rows),
+        'import_seconds': sum(row[1] for row in rows) / 1e6,
+        'top': [(module, cumulative / 1e6) for module, _, cumulative, _ in top_level],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    screens = [LOGIN] + list(PAGES)
+    parser.add_argument('--pages', default=','.join(screens), help='comma-separated subset of ' + ', '.join(screens))
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='slowest top-level imports to list per screen')
+    args = parser.parse_args(argv)
+
+    pages = [p.strip() for p in args.pages.split(',') if p.strip()]
+    unknown = [p for p in pages if p not in screens]
+    if unknown:
+        parser.error(f"unknown pages: {', '.join(unknown)}")
+
+    print(f"{'screen':24s} {'first run':>10s} {'imports':>10s} {'modules':>8s}")
+    failed = False
+    for page in pages:
+        report = profile(page)
+        failed |= bool(report['exceptions'])
+        print(f"{page:24s} {report['first_run']:9.2f}s {report['import_seconds']:9.2f}s {report['modules']:8d}")
+        for module, seconds in report['top'][:args.top]:
+            print(f"    {module:40s} {seconds * 1000:8.1f} ms")
+        for exception in report['exceptions']:
+            print(f"    exception: {exception}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import importlib
+
+# Navigation order: page name -> (icon, module). A page module and the heavy
+# libraries it imports (plotly, numpy, pandas) load on its first visit only.
+PAGES = {
+    'Calendar': ('📅', 'pages.weekly_calendar'),
+    'Account Overview': ('📊', 'pages.account_overview'),
+    'Performance Analytics': ('📈', 'pages.performance_analytics'),
+    'Drawdown Analysis': ('📉', 'pages.drawdown_analysis'),
+    'Trade Statistics': ('📋', 'pages.trade_statistics'),
+    'Consecutive Metrics': ('🔄', 'pages.consecutive_metrics'),
+    'Advanced Metrics': ('⚡', 'pages.advanced_metrics'),
+    'P&L Heatmap': ('🗓️', 'pages.pnl_heatmap'),
+    'Multi-Account': ('🗂️', 'pages.multi_account'),
+    'Strategy Breakdown': ('🧩', 'pages.strategy_breakdown'),
+}
+
+def load_page(name):
+    """Imports the page module registered under name (cached by Python after the first call)."""
+    return importlib.import_module(PAGES[name][1])
@@ -1,32 +1,49 @@
 import streamlit as st
-from utils.data_processing import get_positions
+import uuid
+from datetime import datetime
+from utils.live_updates import subscribe, DEFAULT_POLL_INTERVAL
+from utils.mt5_convert import POSITION_SCHEMA, records_to_frame
+
+REFRESH_INTERVALS = [0.25, 0.5, 1.0, 2.0, 5.0]
 
 def show():
     """Display account overview metrics."""
     st.header("📊 Account Overview")
-    
+
+    interval = st.select_slider(
+        "Refresh interval (seconds)",
+        options=REFRESH_INTERVALS,
+        value=min(REFRESH_INTERVALS, key=lambda x: abs(x - DEFAULT_POLL_INTERVAL)),
+        key="live_refresh_interval",
+    )
+    # Identifies this session to the shared poller; its lease lapses once the fragment stops rendering
+    subscriber = st.session_state.setdefault('live_subscriber', uuid.uuid4().hex)
+    # Only this fragment reruns on each tick; the rest of the script is untouched
+    st.fragment(show_live_metrics, run_every=interval)(subscriber, interval)
+
+def show_live_metrics(subscriber, interval):
+    """Render account and position metrics from the live poller snapshot."""
+    snapshot = subscribe(subscriber, interval).snapshot()
+    if snapshot['account'] is not None:
+        st.session_state.account_info = snapshot['account']
     info = st.session_state.account_info
     currency_symbol = st.session_state.currency_symbol
-    
-    # Get current positions for floating P/L calculation
-    positions_df = get_positions()
-    floating_pl = 0
-    margin_used = 0
-    
-    if positions_df is not None and not positions_df.empty:
-        floating_pl = positions_df['profit'].sum()
-        #margin_used = positions_df['margin'].sum()
-        if "margin" in positions_df.columns:
-            margin_used = positions_df["margin"].sum()
-        else:
-            margin_used = 0  # or compute it another way
-    
+
+    if snapshot['updated_at']:
+        st.caption(f"Last change: {datetime.fromtimestamp(snapshot['updated_at']):%H:%M:%S}")
+
+    # Current positions for floating P/L calculation
+    positions_df = records_to_frame(snapshot['positions'], POSITION_SCHEMA) if snapshot['positions'] else None
+    floating_pl = positions_df['profit'].sum() if positions_df is not None else 0
+
     # Calculate metrics
     balance = info.balance
     equity = balance + floating_pl
     free_margin = info.margin_free
     credit = info.credit if hasattr(info, 'credit') else 0
-    margin_level = (equity / margin_used * 100) if margin_used > 0 else 0
+    # Margin figures come from the terminal; positions carry no margin of their own
+    margin_used = info.margin
+    margin_level = info.margin_level
     
     # Display metrics in columns
     col1, col2 = st.columns(2)
@@ -3,7 +3,9 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from datetime import datetime, timedelta
-from utils.data_processing import get_trading_history, calculate_trading_metrics
+from utils.data_processing import get_trading_history, get_trading_metrics, get_rollup
+from utils.rollup import rollup
+from utils.deal_schema import DEAL_ENTRY_OUT
 
 def show():
     """Display advanced trading metrics and analysis."""
@@ -18,7 +20,7 @@ def show():
     
     with st.spinner("Calculating advanced metrics..."):
         deals_df = get_trading_history(from_date, to_date)
-        metrics = calculate_trading_metrics(deals_df)
+        metrics = get_trading_metrics(deals_df)
     
     if not metrics:
         st.warning("No trading data available for the selected period.")
@@ -72,7 +74,7 @@ def show():
     st.subheader("Performance Analysis")
     
     if deals_df is not None and not deals_df.empty:
-        exit_trades = deals_df[deals_df['entry'] == 'Exit'].copy()
+        exit_trades = deals_df[deals_df['entry'] == DEAL_ENTRY_OUT]
         
         if not exit_trades.empty:
             # Profit Distribution Chart
@@ -92,10 +94,10 @@ def show():
             
             with col2:
                 st.markdown("#### Monthly Performance")
-                # Monthly aggregation
-                exit_trades['month'] = exit_trades['time'].dt.to_period('M')
-                monthly_profit = exit_trades.groupby('month')['profit'].sum().reset_index()
-                monthly_profit['month'] = monthly_profit['month'].astype(str)
+                # Monthly aggregation from the rollup cube
+                cube = get_rollup(deals_df)
+                monthly_profit = rollup(cube, 'M')
+                monthly_profit['month'] = monthly_profit['period'].dt.strftime('%Y-%m')
                 
                 fig = px.bar(
                     monthly_profit,
@@ -106,6 +108,22 @@ def show():
                 )
                 fig.update_layout(template="plotly_dark")
                 st.plotly_chart(fig, use_container_width=True)
+            
+            # Per-symbol breakdown from the same cube
+            st.markdown("#### Performance by Symbol")
+            by_symbol = rollup(cube, None, ['symbol'])
+            by_symbol['win_rate'] = by_symbol['wins'] / by_symbol['trades'] * 100
+            by_symbol = by_symbol.sort_values('profit', ascending=False)
+            st.dataframe(
+                by_symbol[['symbol', 'trades', 'profit', 'win_rate', 'max_profit', 'min_profit']].style.format({
+                    'profit': f"{currency_symbol}{{:,.2f}}",
+                    'win_rate': "{:.1f}%",
+                    'max_profit': f"{currency_symbol}{{:,.2f}}",
+                    'min_profit': f"{currency_symbol}{{:,.2f}}",
+                }),
+                use_container_width=True,
+                hide_index=True,
+            )
     
     # Performance Ratings
     st.subheader("Performance Rating")
@@ -1,6 +1,6 @@
 import streamlit as st
 from datetime import datetime, timedelta
-from utils.data_processing import get_trading_history, calculate_trading_metrics
+from utils.data_processing import get_trading_history, get_trading_metrics
 
 def show():
     """Display consecutive trade metrics."""
@@ -15,7 +15,7 @@ def show():
     
     with st.spinner("Analyzing consecutive patterns..."):
         deals_df = get_trading_history(from_date, to_date)
-        metrics = calculate_trading_metrics(deals_df)
+        metrics = get_trading_metrics(deals_df)
     
     if not metrics:
         st.warning("No trading data available for the selected period.")
@@ -1,6 +1,15 @@
 import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, timedelta
-from utils.data_processing import get_trading_history, calculate_trading_metrics
+from utils.data_processing import get_trading_history, get_trading_metrics, get_balance_curve, get_balance_at, get_trade_curve, get_drawdowns
+from utils.drawdown import absolute_drawdown
+from utils.downsampling import DEFAULT_POINT_BUDGET, lttb
+from utils.deal_schema import DEAL_ENTRY_OUT
+from utils.metrics_cache import deal_fingerprint
+from utils.monte_carlo import run_monte_carlo, summarize
+
+SIMULATION_METHODS = {'Bootstrap': 'bootstrap', 'Permutation': 'permute'}
 
 def show():
     """Display drawdown analysis."""
@@ -15,7 +24,10 @@ def show():
     
     with st.spinner("Analyzing drawdowns..."):
         deals_df = get_trading_history(from_date, to_date)
-        metrics = calculate_trading_metrics(deals_df)
+        metrics = get_trading_metrics(deals_df)
+        _, balance = get_balance_curve(deals_df)
+        times, trade_pl = get_trade_curve(deals_df)
+        drawdowns = get_drawdowns(deals_df)
     
     if not metrics:
         st.warning("No trading data available for the selected period.")
@@ -29,17 +41,27 @@ def show():
     with col1:
         st.subheader("Drawdown Metrics")
         
-        # Balance Absolute Drawdown
-        initial_balance = info.balance - metrics['net_profit']  # Approximate initial balance
-        absolute_drawdown = initial_balance - (initial_balance - metrics['max_drawdown'])
+        # Balance before the first deal: the balance at the end of the range less every
+        # balance change in it. Drawdowns are measured on the trading result from there,
+        # so deposits and withdrawals neither cause nor hide a drawdown.
+        end_balance = get_balance_at(to_date, info.balance)
+        initial_balance = end_balance - balance[-1] if len(balance) else end_balance
+        net_trading = trade_pl[-1] if len(trade_pl) else 0.0
+        episodes = drawdowns['episodes']
+        absolute_dd = absolute_drawdown(trade_pl + initial_balance, initial_balance)
         
-        st.metric("Balance Absolute Drawdown", f"{currency_symbol}{absolute_drawdown:,.2f}",
+        st.metric("Balance Absolute Drawdown", f"{currency_symbol}{absolute_dd:,.2f}",
                  help="Balance Absolute Drawdown represents the difference between the initial balance and the minimum balance.")
         
         # Balance Drawdown Maximal
-        max_dd_percent = (metrics['max_drawdown'] / initial_balance * 100) if initial_balance > 0 else 0
+        if not episodes.empty:
+            worst = episodes.iloc[0]
+            max_dd = worst['depth']
+            max_dd_percent = max_dd / (worst['peak_balance'] + initial_balance) * 100 if worst['peak_balance'] + initial_balance > 0 else 0
+        else:
+            max_dd, max_dd_percent = 0.0, 0.0
         st.metric("Balance Drawdown Maximal", 
-                 f"{currency_symbol}{metrics['max_drawdown']:,.2f} ({max_dd_percent:.1f}%)",
+                 f"{currency_symbol}{max_dd:,.2f} ({max_dd_percent:.1f}%)",
                  help="Maximum drawdown is the largest loss from a peak to a low in the balance before changing direction upward again.")
         
         # Risk Assessment
@@ -70,8 +92,111 @@ def show():
         ### Recovery Metrics
         """)
         
-        # Recovery statistics
-        if metrics['max_drawdown'] > 0:
-            recovery_ratio = metrics['net_profit'] / metrics['max_drawdown']
+        # Recovery statistics, on the same trading-result basis as the drawdown
+        if max_dd > 0:
+            recovery_ratio = net_trading / max_dd
             st.metric("Recovery Ratio", f"{recovery_ratio:.2f}x",
-                     help="How many times the net profit covers the maximum drawdown.")
+                     help="How many times the net trading result (after commission, swap and fees) covers the maximum drawdown.")
+    
+    # Underwater Curve
+    st.subheader("Underwater Curve")
+    if len(times):
+        peak = drawdowns['peak'] + initial_balance
+        underwater_pct = np.divide(drawdowns['underwater'] * 100, peak, out=np.zeros(len(peak)), where=peak > 0)
+        keep = lttb(times.astype('datetime64[ns]').astype(np.int64), underwater_pct, DEFAULT_POINT_BUDGET)
+        fig = go.Figure()
+        fig.add_trace(go.Scattergl(
+            x=times[keep],
+            y=underwater_pct[keep],
+            mode='lines',
+            fill='tozeroy',
+            name='Drawdown',
+            line=dict(color='#ff4444', width=1)
+        ))
+        fig.update_layout(
+            title="Distance Below Previous Balance Peak",
+            xaxis_title="Date",
+            yaxis_title="Drawdown (%)",
+            template="plotly_dark",
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Drawdown Episodes
+    st.subheader("Largest Drawdown Episodes")
+    if episodes.empty:
+        st.info("The balance never fell below a previous peak in the selected period.")
+    else:
+        top_n = 1
+        if len(episodes) > 1:
+            top_n = st.slider("Episodes to show", min_value=1, max_value=min(50, len(episodes)), value=min(10, len(episodes)))
+        top = episodes.head(top_n)
+        display_df = top[['peak_time', 'trough_time', 'recovery_time', 'depth']].copy()
+        display_df['depth_pct'] = top['depth'] / (top['peak_balance'] + initial_balance) * 100
+        display_df['duration'] = top['duration'].astype(str)
+        display_df['time_to_trough'] = top['time_to_trough'].astype(str)
+        display_df['recovery_time'] = top['recovery_time'].astype(str).where(top['recovered'], "Not recovered")
+        st.dataframe(
+            display_df.style.format({
+                'depth': f"{currency_symbol}{{:,.2f}}",
+                'depth_pct': "{:.1f}%",
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(f"{len(episodes):,} drawdown episodes in the selected period.")
+    
+    # Monte Carlo Simulation
+    st.subheader("Monte Carlo Simulation")
+    st.markdown("""
+    Resamples the sequence of closed-trade results many times to show how deep drawdowns and losing
+    streaks could have been with the same trades in a different order.
+    """)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_paths = st.select_slider("Simulated paths", options=[10_000, 25_000, 50_000, 100_000], value=10_000)
+    with col2:
+        method = st.radio("Method", list(SIMULATION_METHODS), horizontal=True,
+                          help="Bootstrap draws trades with replacement; Permutation reshuffles the realized trades.")
+    with col3:
+        ruin_percent = st.slider("Ruin threshold (% of starting balance lost)", 10, 100, 50, step=5)
+    
+    ruin_level = initial_balance * (1 - ruin_percent / 100)
+    params = (deal_fingerprint(deals_df), n_paths, method, ruin_percent, initial_balance)
+    if st.button("Run Simulation"):
+        profits = deals_df['profit'].to_numpy()[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT]
+        with st.spinner(f"Simulating {n_paths:,} paths..."):
+            results = run_monte_carlo(profits, n_paths, SIMULATION_METHODS[method],
+                                      initial_balance=initial_balance, ruin_level=ruin_level, seed=0)
+        st.session_state.monte_carlo = {'params': params, 'results': results}
+    
+    simulation = st.session_state.get('monte_carlo')
+    if simulation and simulation['params'] == params and simulation['results'] is not None:
+        results = simulation['results']
+        summary = summarize(results)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Median Max Drawdown", f"{currency_symbol}{summary['max_drawdown'][50]:,.2f}",
+                    help="Half of the simulated paths had a deeper maximum drawdown.")
+        col2.metric("95th Percentile Drawdown", f"{currency_symbol}{summary['max_drawdown'][95]:,.2f}",
+                    help="Only 5% of the simulated paths had a deeper maximum drawdown.")
+        col3.metric("95th Percentile Losing Streak", f"{summary['longest_losing_streak'][95]:.0f}",
+                    help="Only 5% of the simulated paths had a longer run of consecutive losses.")
+        col4.metric("Risk of Ruin", f"{summary['risk_of_ruin']:.2f}%",
+                    help=f"Share of paths whose balance fell to {currency_symbol}{ruin_level:,.2f} or below.")
+        
+        counts, edges = np.histogram(results['max_drawdown'], bins=50)
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, marker_color='#ff4444'))
+        fig.update_layout(
+            title="Distribution of Maximum Drawdown",
+            xaxis_title=f"Max Drawdown ({info.currency})",
+            yaxis_title="Paths",
+            template="plotly_dark",
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            f"Final balance: 5th percentile {currency_symbol}{summary['final_equity'][5]:,.2f}, "
+            f"median {currency_symbol}{summary['final_equity'][50]:,.2f}, "
+            f"95th percentile {currency_symbol}{summary['final_equity'][95]:,.2f}."
+        )
@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+from utils.data_processing import prepare_deals_frame, calculate_trading_metrics
+from utils.multi_account import ACCOUNTS_FILE, MAX_TERMINALS, load_accounts, from_columnar, iter_account_histories
+
+SUMMARY_COLUMNS = {
+    'total_trades': 'Trades',
+    'net_profit': 'Net Profit',
+    'win_rate': 'Win Rate %',
+    'profit_factor': 'Profit Factor',
+    'max_drawdown': 'Max Drawdown',
+    'sharpe_ratio': 'Sharpe Ratio',
+}
+
+def _summary_row(name, metrics):
+    row = {'Account': name}
+    for key, label in SUMMARY_COLUMNS.items():
+        row[label] = metrics.get(key, 0) if metrics else 0
+    return row
+
+def fetch_accounts(accounts, from_date, to_date, max_workers):
+    """Fetches all accounts in parallel, updating a progress bar as each one completes."""
+    frames, errors = {}, {}
+    progress = st.progress(0.0, text="Starting terminals...")
+    for done, result in enumerate(iter_account_histories(accounts, from_date, to_date, max_workers), start=1):
+        if result['error']:
+            errors[result['name']] = result['error']
+        elif result['columns']:
+            deals_df = from_columnar(result['columns'])
+            if not deals_df.empty:
+                frames[result['name']] = prepare_deals_frame(deals_df)
+        progress.progress(done / len(accounts), text=f"Fetched {result['name']} ({done}/{len(accounts)})")
+    progress.empty()
+    return frames, errors
+
+def show():
+    """Display per-account and consolidated metrics for several MT5 accounts."""
+    st.header("🗂️ Multi-Account Overview")
+
+    start_date = st.session_state.get('start_date', datetime.now().date() - timedelta(days=730))
+    end_date = st.session_state.get('end_date', datetime.now().date())
+
+    from_date = datetime.combine(start_date, datetime.min.time())
+    to_date = datetime.combine(end_date, datetime.max.time())
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        accounts_path = st.text_input("Accounts file", ACCOUNTS_FILE,
+                                      help='JSON list of {"login", "password", "server", "path", "name"} objects. '
+                                           '"path" points at the terminal used for that account; every account '
+                                           'needs its own, separate from the terminal this dashboard is logged in to.')
+    with col2:
+        max_workers = st.number_input("Parallel terminals", min_value=1, max_value=64, value=MAX_TERMINALS)
+
+    if st.button("Fetch Accounts"):
+        try:
+            accounts = load_accounts(accounts_path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            st.error(f"Could not read accounts file: {str(e)}")
+            return
+        if not accounts:
+            st.warning("The accounts file does not list any accounts.")
+            return
+        with st.spinner("Fetching account histories..."):
+            st.session_state.multi_account = fetch_accounts(accounts, from_date, to_date, int(max_workers))
+
+    if 'multi_account' not in st.session_state:
+        st.info("Fetch the accounts listed in the accounts file to compare them.")
+        return
+
+    frames, errors = st.session_state.multi_account
+    for name, error in errors.items():
+        st.error(f"{name}: {error}")
+    if not frames:
+        st.warning("No trading data available for the selected accounts.")
+        return
+
+    currency_symbol = st.session_state.currency_symbol
+    rows = [_summary_row(name, calculate_trading_metrics(deals_df)) for name, deals_df in frames.items()]
+
+    # Consolidated view: every account's deals on one timeline
+    combined_df = pd.concat(frames.values(), ignore_index=True).sort_values('time', kind='stable', ignore_index=True)
+    combined = calculate_trading_metrics(combined_df)
+    if not combined:
+        st.warning("The selected accounts have no closed trades in the selected period.")
+        return
+    rows.append(_summary_row('All Accounts', combined))
+
+    st.subheader("Consolidated")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Accounts", f"{len(frames)}")
+    col2.metric("Net Profit", f"{currency_symbol}{combined['net_profit']:,.2f}")
+    col3.metric("Total Trades", f"{combined['total_trades']:,}")
+    col4.metric("Max Drawdown", f"{currency_symbol}{combined['max_drawdown']:,.2f}")
+
+    st.subheader("Per Account")
+    summary_df = pd.DataFrame(rows)
+    st.dataframe(
+        summary_df.style.format({
+            'Net Profit': f"{currency_symbol}{{:,.2f}}",
+            'Win Rate %': "{:.1f}",
+            'Profit Factor': "{:.2f}",
+            'Max Drawdown': f"{currency_symbol}{{:,.2f}}",
+            'Sharpe Ratio': "{:.2f}",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
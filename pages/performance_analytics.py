@@ -1,7 +1,19 @@
 import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from utils.data_processing import get_trading_history, calculate_trading_metrics
+import numpy as np
+from utils.data_processing import get_trading_history, get_trading_metrics, get_balance_curve, get_balance_at, get_rolling_metrics
+from utils.downsampling import DEFAULT_POINT_BUDGET, downsample_series, lttb
+from utils.rolling_metrics import ROLLING_WINDOWS
+
+ROLLING_LABELS = {
+    'sharpe': 'Sharpe Ratio',
+    'win_rate': 'Win Rate (%)',
+    'profit_factor': 'Profit Factor',
+    'expectancy': 'Expectancy',
+    'drawdown': 'Drawdown',
+}
+ROLLING_COLORS = ['#00ff88', '#29b6f6', '#ffb300', '#ab47bc', '#ef5350']
 
 def show():
     """Display performance analytics."""
@@ -16,7 +28,7 @@ def show():
     
     with st.spinner("Calculating performance metrics..."):
         deals_df = get_trading_history(from_date, to_date)
-        metrics = calculate_trading_metrics(deals_df)
+        metrics = get_trading_metrics(deals_df)
     
     if not metrics:
         st.warning("No trading data available for the selected period.")
@@ -70,23 +82,75 @@ def show():
     # Balance Graph
     st.subheader("Balance Graph")
     st.markdown("""
-    The Balance Graph shows your trading performance over time. The X-axis shows the progression 
-    of trades, and the Y-axis shows your account balance evolution.
+    The Balance Graph shows your account balance over time, including deposits, withdrawals and credit.
+    Long histories are reduced to the selected number of points while keeping the curve's shape;
+    narrow the visible range to see more detail.
     """)
     
-    if metrics['cumulative_profit']:
+    times, balance = get_balance_curve(deals_df)
+    if len(times):
+        first_day = times[0].astype('datetime64[D]').item()
+        last_day = times[-1].astype('datetime64[D]').item()
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            visible = (first_day, last_day)
+            if first_day < last_day:
+                visible = st.slider("Visible range", min_value=first_day, max_value=last_day, value=visible)
+        with col2:
+            budget = st.select_slider("Chart points", options=[500, 1000, 2000, 5000, 10000], value=DEFAULT_POINT_BUDGET)
+        window = (datetime.combine(visible[0], datetime.min.time()), datetime.combine(visible[1], datetime.max.time()))
+        # The curve sums the period's deals from zero; anchor its end to the balance at the end of the range
+        offset = get_balance_at(to_date, st.session_state.account_info.balance) - balance[-1]
+        plot_times, plot_balance = downsample_series(times, balance + offset, budget, window)
+
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(range(1, len(metrics['cumulative_profit']) + 1)),
-            y=metrics['cumulative_profit'],
+        fig.add_trace(go.Scattergl(
+            x=plot_times,
+            y=plot_balance,
             mode='lines',
-            name='Cumulative Profit',
+            name='Balance',
             line=dict(color='#00ff88', width=2)
         ))
         fig.update_layout(
-            title="Cumulative Profit Over Trades",
-            xaxis_title="Number of Trades",
-            yaxis_title=f"Cumulative Profit ({st.session_state.account_info.currency})",
+            title=f"Balance Over Time ({len(plot_times):,} of {len(times):,} points)",
+            xaxis_title="Date",
+            yaxis_title=f"Balance ({st.session_state.account_info.currency})",
+            template="plotly_dark",
+            height=400
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Rolling Metrics
+    st.subheader("Rolling Metrics")
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        kind = st.radio("Window", ["Trades", "Days"], horizontal=True,
+                        help="Trades: the last N closed trades. Days: the last N calendar days (Sharpe annualized).").lower()
+    with col2:
+        metric = st.selectbox("Metric", list(ROLLING_LABELS), format_func=ROLLING_LABELS.get)
+    with col3:
+        windows = st.multiselect("Window sizes", ROLLING_WINDOWS[kind], default=list(ROLLING_WINDOWS[kind][1:3]))
+    
+    x_values, rolling = get_rolling_metrics(deals_df, kind)
+    if windows and len(x_values):
+        fig = go.Figure()
+        for color, window in zip(ROLLING_COLORS, sorted(windows)):
+            values = rolling[window][metric]
+            valid = np.flatnonzero(np.isfinite(values))
+            if len(valid) == 0:
+                continue
+            keep = valid[lttb(x_values[valid].astype('datetime64[ns]').astype(np.int64), values[valid], DEFAULT_POINT_BUDGET)]
+            fig.add_trace(go.Scattergl(
+                x=x_values[keep],
+                y=values[keep],
+                mode='lines',
+                name=f"{window} {kind}",
+                line=dict(color=color, width=1.5)
+            ))
+        fig.update_layout(
+            title=f"Rolling {ROLLING_LABELS[metric]}",
+            xaxis_title="Date",
+            yaxis_title=ROLLING_LABELS[metric],
             template="plotly_dark",
             height=400
         )
@@ -0,0 +1,144 @@
+import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
+from datetime import date, datetime, timedelta
+from utils.data_processing import get_trading_history, get_daily_array, slice_daily_array, get_time_bins
+from utils.time_bins import TRADING_SESSIONS, slice_time_bins, session_totals
+
+DAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HEATMAP_COLORSCALE = [[0.0, '#b71c1c'], [0.5, '#262626'], [1.0, '#2e7d32']]
+TIME_METRICS = ['Profit', 'Trades', 'Win Rate']
+
+def _metric_grid(metric, profit, trades, wins):
+    """The grid to plot for a metric; cells without trades are blank."""
+    if metric == 'Profit':
+        return np.where(trades > 0, profit, np.nan)
+    if metric == 'Trades':
+        return trades.astype(float)
+    return np.divide(wins * 100, trades, out=np.full(trades.shape, np.nan), where=trades > 0)
+
+def _time_heatmap(grid, metric, x, y, currency_symbol, height):
+    """Heatmap figure of a metric grid, centered on break-even (profit) or 50% (win rate)."""
+    if metric == 'Profit':
+        limit = (np.nanmax(np.abs(grid)) if np.isfinite(grid).any() else 0) or 1.0
+        scale = dict(colorscale=HEATMAP_COLORSCALE, zmid=0, zmin=-limit, zmax=limit)
+        value = f"{currency_symbol}%{{z:,.2f}}"
+    elif metric == 'Win Rate':
+        scale = dict(colorscale=HEATMAP_COLORSCALE, zmid=50, zmin=0, zmax=100)
+        value = "%{z:.1f}%"
+    else:
+        scale = dict(colorscale='Blues')
+        value = "%{z:,.0f}"
+    fig = go.Figure(go.Heatmap(
+        z=grid,
+        x=x,
+        y=y,
+        xgap=2,
+        ygap=2,
+        hovertemplate=f"%{{y}} %{{x}}<br>{metric}: {value}<extra></extra>",
+        **scale,
+    ))
+    fig.update_layout(
+        template="plotly_dark",
+        height=height,
+        margin=dict(l=40, r=10, t=10, b=30),
+        xaxis=dict(type='category', showgrid=False, zeroline=False),
+        yaxis=dict(autorange='reversed', showgrid=False, zeroline=False),
+    )
+    return fig
+
+def _year_grid(daily_array, year):
+    """Lays out one calendar year as 7 weekday rows by week columns, GitHub style."""
+    first_day = date(year, 1, 1)
+    last_day = date(year, 12, 31)
+    profit, trades = slice_daily_array(daily_array, first_day, last_day)
+    dates = np.arange(np.datetime64(first_day), np.datetime64(last_day) + 1)
+
+    # Pad so the first column starts on Monday and the last one ends on Sunday
+    lead = first_day.weekday()
+    tail = (-(lead + len(profit))) % 7
+    def pad(values, fill):
+        return np.concatenate([np.full(lead, fill, dtype=values.dtype), values, np.full(tail, fill, dtype=values.dtype)])
+
+    profit_grid = pad(profit.astype(float), np.nan).reshape(-1, 7).T
+    trades_grid = pad(trades, 0).reshape(-1, 7).T
+    date_grid = pad(dates.astype(str).astype(object), '').reshape(-1, 7).T
+    # Days without trades stay blank rather than showing as break-even
+    profit_grid = np.where(trades_grid > 0, profit_grid, np.nan)
+    return profit_grid, trades_grid, date_grid
+
+def show():
+    """Display a year-at-a-glance P/L heatmap."""
+    st.header("🗓️ P&L Heatmap")
+
+    start_date = st.session_state.get('start_date', datetime.now().date() - timedelta(days=730))
+    end_date = st.session_state.get('end_date', datetime.now().date())
+
+    from_date = datetime.combine(start_date, datetime.min.time())
+    to_date = datetime.combine(end_date, datetime.max.time())
+
+    with st.spinner("Building daily heatmap..."):
+        deals_df = get_trading_history(from_date, to_date)
+        daily_array = get_daily_array(deals_df)
+
+    if daily_array['start'] is None:
+        st.warning("No trading data available for the selected period.")
+        return
+
+    currency_symbol = st.session_state.currency_symbol
+    years = list(range(end_date.year, start_date.year - 1, -1))
+    selected_years = st.multiselect("Years", years, default=years[:5])
+
+    for year in sorted(selected_years, reverse=True):
+        profit_grid, trades_grid, date_grid = _year_grid(daily_array, year)
+        year_profit = np.nansum(profit_grid)
+        year_trades = int(trades_grid.sum())
+        limit = (np.nanmax(np.abs(profit_grid)) if year_trades else 0) or 1.0
+
+        st.markdown(f"#### {year} — {currency_symbol}{year_profit:,.2f} over {year_trades:,} trades")
+        fig = go.Figure(go.Heatmap(
+            z=profit_grid,
+            customdata=np.dstack([date_grid, trades_grid]),
+            y=DAY_LABELS,
+            colorscale=HEATMAP_COLORSCALE,
+            zmid=0,
+            zmin=-limit,
+            zmax=limit,
+            xgap=3,
+            ygap=3,
+            hovertemplate=f"%{{customdata[0]}}<br>P/L: {currency_symbol}%{{z:,.2f}}<br>Trades: %{{customdata[1]}}<extra></extra>",
+            showscale=False,
+        ))
+        fig.update_layout(
+            template="plotly_dark",
+            height=220,
+            margin=dict(l=40, r=10, t=10, b=10),
+            xaxis=dict(showticklabels=False, showgrid=False, zeroline=False),
+            yaxis=dict(autorange='reversed', showgrid=False, zeroline=False),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Hour of day x weekday, from bins built once per dataset
+    st.subheader("Time of Day")
+    time_bins = get_time_bins(deals_df)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        metric = st.radio("Metric", TIME_METRICS, horizontal=True)
+    with col2:
+        symbols = st.multiselect("Symbols", time_bins['symbols'], placeholder="All symbols")
+    with col3:
+        utc_offset = st.number_input("Server time (UTC+)", min_value=-12, max_value=14, value=0, step=1,
+                                     help="Hours the trade server clock runs ahead of UTC; hours below are shown in UTC.")
+
+    profit, trades, wins = slice_time_bins(time_bins, symbols or None, int(utc_offset))
+    hours = [f"{hour:02d}:00" for hour in range(24)]
+    st.plotly_chart(_time_heatmap(_metric_grid(metric, profit, trades, wins), metric, hours, DAY_LABELS, currency_symbol, 320),
+                    use_container_width=True)
+
+    totals = session_totals(profit, trades, wins)
+    session_grid = _metric_grid(metric, *(np.column_stack(measure) for measure in zip(*totals.values())))
+    st.markdown("##### Trading Sessions (UTC)")
+    st.plotly_chart(_time_heatmap(session_grid, metric, list(TRADING_SESSIONS), DAY_LABELS, currency_symbol, 320),
+                    use_container_width=True)
+    st.caption(", ".join(f"{name} {start:02d}:00–{end:02d}:00" for name, (start, end) in TRADING_SESSIONS.items())
+               + " UTC. Trades in overlapping hours count towards both sessions.")
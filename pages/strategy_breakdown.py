@@ -0,0 +1,88 @@
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime, timedelta
+from utils.data_processing import get_trading_history, get_trading_metrics, get_strategy_breakdown
+from utils.strategy_breakdown import BREAKDOWN_GROUPINGS
+
+BREAKDOWN_COLUMNS = {
+    'total_trades': 'Trades',
+    'net_profit': 'Net Profit',
+    'profit_factor': 'Profit Factor',
+    'win_rate': 'Win Rate',
+    'expected_payoff': 'Expected Payoff',
+    'max_drawdown': 'Max Drawdown',
+    'recovery_factor': 'Recovery Factor',
+    'sharpe_ratio': 'Sharpe Ratio',
+    'max_consecutive_wins': 'Max Wins in a Row',
+    'max_consecutive_losses': 'Max Losses in a Row',
+    'largest_win': 'Largest Win',
+    'largest_loss': 'Largest Loss',
+    'short_win_rate': 'Short Win Rate',
+}
+
+def show():
+    """Display metrics broken down by symbol and magic number."""
+    st.header("🧩 Strategy Breakdown")
+
+    # Get date range
+    start_date = st.session_state.get('start_date', datetime.now().date() - timedelta(days=730))
+    end_date = st.session_state.get('end_date', datetime.now().date())
+
+    from_date = datetime.combine(start_date, datetime.min.time())
+    to_date = datetime.combine(end_date, datetime.max.time())
+
+    grouping = st.radio("Group by", list(BREAKDOWN_GROUPINGS), horizontal=True,
+                        help="Magic numbers identify the Expert Advisor or strategy that placed a trade; 0 is manual trading.")
+    by = BREAKDOWN_GROUPINGS[grouping]
+
+    with st.spinner("Breaking down strategies..."):
+        deals_df = get_trading_history(from_date, to_date)
+        metrics = get_trading_metrics(deals_df)
+        breakdown = get_strategy_breakdown(deals_df, by)
+
+    if not metrics or breakdown.empty:
+        st.warning("No trading data available for the selected period.")
+        return
+
+    currency_symbol = st.session_state.currency_symbol
+    labels = breakdown[list(by)].astype(str).agg(' / '.join, axis=1)
+
+    # Net profit per group
+    top = breakdown.head(30)
+    fig = go.Figure(go.Bar(
+        x=labels[:len(top)],
+        y=top['net_profit'],
+        marker_color=['#00ff88' if p >= 0 else '#ff4444' for p in top['net_profit']],
+    ))
+    fig.update_layout(
+        title=f"Net Profit by {grouping}",
+        xaxis_title=grouping,
+        yaxis_title=f"Net Profit ({currency_symbol})",
+        template="plotly_dark",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    if len(breakdown) > len(top):
+        st.caption(f"Showing the {len(top)} most profitable of {len(breakdown):,} groups.")
+
+    # Full metric table
+    st.subheader("Metrics by " + grouping)
+    display_df = breakdown[list(by) + list(BREAKDOWN_COLUMNS)].rename(columns=BREAKDOWN_COLUMNS)
+    display_df = display_df.rename(columns={'symbol': 'Symbol', 'magic': 'Magic'})
+    money = f"{currency_symbol}{{:,.2f}}"
+    st.dataframe(
+        display_df.style.format({
+            'Net Profit': money,
+            'Expected Payoff': money,
+            'Max Drawdown': money,
+            'Largest Win': money,
+            'Largest Loss': money,
+            'Profit Factor': "{:.2f}",
+            'Recovery Factor': "{:.2f}",
+            'Sharpe Ratio': "{:.2f}",
+            'Win Rate': "{:.1f}%",
+            'Short Win Rate': "{:.1f}%",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
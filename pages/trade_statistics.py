@@ -1,6 +1,6 @@
 import streamlit as st
 from datetime import datetime, timedelta
-from utils.data_processing import get_trading_history, calculate_trading_metrics
+from utils.data_processing import get_trading_history, get_trading_metrics, get_round_trips
 
 def show():
     """Display detailed trade statistics."""
@@ -15,7 +15,8 @@ def show():
     
     with st.spinner("Analyzing trade statistics..."):
         deals_df = get_trading_history(from_date, to_date)
-        metrics = calculate_trading_metrics(deals_df)
+        metrics = get_trading_metrics(deals_df)
+        round_trips = get_round_trips(deals_df)
     
     if not metrics:
         st.warning("No trading data available for the selected period.")
@@ -72,3 +73,33 @@ def show():
         
         st.metric("Short Trade Win Rate", f"{metrics['short_win_rate']:.1f}%",
                  help="Win rate specifically for short trades.")
+
+    # Round-trip view: one row per position instead of one per exit deal
+    if not round_trips.empty:
+        st.subheader("Round-Trip Trades")
+        hold_times = round_trips['hold_time'].dropna()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Positions Closed", f"{len(round_trips):,}",
+                    help="Positions with at least one exit, however many partial closes they took.")
+        col2.metric("Partially Closed", f"{int((round_trips['exits'] > 1).sum()):,}",
+                    help="Positions closed in more than one exit deal.")
+        col3.metric("Average Hold Time", str(hold_times.mean().round('s')) if not hold_times.empty else "N/A",
+                    help="Average time from the first entry to the last exit.")
+        col4.metric("Average Volume", f"{round_trips['volume'].mean():,.2f}",
+                    help="Average lots opened per position.")
+
+        display_df = round_trips.sort_values('close_time', ascending=False).head(500).copy()
+        display_df['hold_time'] = display_df['hold_time'].astype(str)
+        st.dataframe(
+            display_df.style.format({
+                'volume': "{:.2f}",
+                'closed_volume': "{:.2f}",
+                'open_price': "{:.5f}",
+                'close_price': "{:.5f}",
+                'profit': f"{currency_symbol}{{:,.2f}}",
+                'net_profit': f"{currency_symbol}{{:,.2f}}",
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption("Latest 500 positions; net P&L includes commission, swap and fees.")
@@ -0,0 +1,217 @@
+import streamlit as st
+import streamlit.components.v1 as components
+import calendar
+import os
+from datetime import datetime, timedelta
+from utils.data_processing import get_trading_history, get_daily_stats, calculate_monthly_stats
+from utils.calendar_renderer import render_calendar_html, render_year_calendar_html, generate_exportable_html
+
+# The PNG and ZIP exporters (Pillow, html2image, playwright) are imported when an export is requested
+
+def show():
+    """Display the monthly calendar of daily P/L with the report export menu."""
+    st.title("📅 Weekly Calendar Performance")
+
+    start_date = st.session_state.get('start_date', datetime.now().date() - timedelta(days=730))
+    end_date = st.session_state.get('end_date', datetime.now().date())
+    currency_symbol = st.session_state.currency_symbol
+
+    # --- Data Fetching ---
+    from_date = datetime.combine(start_date, datetime.min.time())
+    to_date = datetime.combine(end_date, datetime.max.time())
+    with st.spinner("Fetching and processing trading history..."):
+        deals_df = get_trading_history(from_date, to_date)
+        daily_stats_df = get_daily_stats(deals_df)
+
+    if not daily_stats_df.empty:
+        # Calculate monthly stats for display
+        selected_year = st.session_state.selected_date.year
+        selected_month = st.session_state.selected_date.month
+        stats = calculate_monthly_stats(daily_stats_df, selected_year, selected_month)
+
+        # --- Monthly Statistics & Export Button ---
+        profit_color = "#2e7d32" if stats['current_profit'] > 0 else ("#b71c1c" if stats['current_profit'] < 0 else "#9E9E9E")
+        delta_color = "#2e7d32" if stats['percentage_change'] > 0 else ("#b71c1c" if stats['percentage_change'] < 0 else "#9E9E9E")
+        delta_symbol = "▲" if stats['percentage_change'] > 0 else ("▼" if stats['percentage_change'] < 0 else "●")
+
+        col_title, col_menu = st.columns([0.95, 0.05])
+
+        with col_title:
+             st.markdown(
+                f"""
+                <div style='text-align:center; padding: 15px; background-color: #1e1e1e; border-radius: 10px; margin-bottom: 20px;'>
+                    <h2 style='margin: 0; color: white; margin-bottom: 10px;'>{calendar.month_name[selected_month]} {selected_year}</h2>
+                    <div style='display: flex; justify-content: center; align-items: center; gap: 30px; flex-wrap: wrap;'>
+                        <div style='text-align: center;'>
+                            <div style='color: #9E9E9E; font-size: 0.9em; margin-bottom: 5px;'>Monthly P/L</div>
+                            <div style='color: {profit_color}; font-size: 1.4em; font-weight: bold;'>
+                                {currency_symbol}{stats['current_profit']:,.2f}
+                            </div>
+                        </div>
+                        <div style='text-align: center;'>
+                            <div style='color: #9E9E9E; font-size: 0.9em; margin-bottom: 5px;'>Total Trades</div>
+                            <div style='color: white; font-size: 1.4em; font-weight: bold;'>
+                                {stats['total_trades']}
+                            </div>
+                        </div>
+                        <div style='text-align: center;'>
+                            <div style='color: #9E9E9E; font-size: 0.9em; margin-bottom: 5px;'>vs. Previous Month</div>
+                            <div style='color: {delta_color}; font-size: 1.1em; font-weight: bold;'>
+                                {delta_symbol} {abs(stats['percentage_change']):.1f}%
+                            </div>
+                        </div>
+                    </div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+        with col_menu:
+            with st.popover("⋮", use_container_width=False):
+                st.markdown("##### Export Options")
+                export_renderer = st.radio(
+                    "Renderer", ["Native", "Browser"], horizontal=True,
+                    help="Native draws the report directly; Browser screenshots the HTML report in headless Chrome."
+                )
+                if st.button("Generate PNG"):
+                    with st.spinner("Creating image... please wait."):
+                        filename = f"report_{selected_year}_{calendar.month_abbr[selected_month]}.png"
+                        if export_renderer == "Native":
+                            from utils.calendar_raster import render_report_png
+                            st.session_state.png_file = {
+                                "data": render_report_png(stats, daily_stats_df, selected_year, selected_month, currency_symbol),
+                                "name": filename
+                            }
+                            st.rerun()
+
+                        # Generate HTML for export
+                        export_html = generate_exportable_html(
+                            stats, daily_stats_df, selected_year, selected_month, currency_symbol
+                        )
+                        # Prepare file paths
+                        output_dir = 'temp_exports'
+                        if not os.path.exists(output_dir):
+                            os.makedirs(output_dir)
+                        full_path = os.path.join(output_dir, filename)
+
+                        # Use html2image to generate the screenshot
+                        from html2image import Html2Image
+                        hti = Html2Image(output_path=output_dir, size=(1200, 1400))
+                        hti.screenshot(html_str=export_html, save_as=filename)
+
+                        # Read the generated image into session state for download
+                        with open(full_path, "rb") as f:
+                            st.session_state.png_file = {
+                                "data": f.read(),
+                                "name": filename
+                            }
+
+                        os.remove(full_path) # Clean up the temp file
+                        st.rerun()
+
+                if st.session_state.png_file:
+                    st.download_button(
+                        label="Download PNG",
+                        data=st.session_state.png_file["data"],
+                        file_name=st.session_state.png_file["name"],
+                        mime="image/png",
+                        # Clear state after download button is clicked
+                        on_click=lambda: st.session_state.update(png_file=None)
+                    )
+
+                st.markdown("##### Batch Export")
+                export_months = st.select_slider(
+                    f"Months of {selected_year}",
+                    options=list(range(1, 13)),
+                    value=(1, 12),
+                    format_func=lambda m: calendar.month_abbr[m],
+                )
+                if st.button("Generate ZIP"):
+                    with st.spinner("Rendering reports... please wait."):
+                        from utils.batch_export import month_range, export_months_zip
+                        from utils.calendar_raster import RasterRenderer
+                        months = month_range(selected_year, export_months[0], selected_year, export_months[1])
+                        try:
+                            renderer = RasterRenderer() if export_renderer == "Native" else None
+                            zip_data = export_months_zip(daily_stats_df, months, currency_symbol, renderer)
+                        except Exception as e:
+                            st.error(f"Batch export failed: {str(e)}")
+                        else:
+                            st.session_state.zip_file = {
+                                "data": zip_data,
+                                "name": f"reports_{selected_year}_{calendar.month_abbr[export_months[0]]}-{calendar.month_abbr[export_months[1]]}.zip"
+                            }
+                            st.rerun()
+
+                if st.session_state.zip_file:
+                    st.download_button(
+                        label="Download ZIP",
+                        data=st.session_state.zip_file["data"],
+                        file_name=st.session_state.zip_file["name"],
+                        mime="application/zip",
+                        on_click=lambda: st.session_state.update(zip_file=None)
+                    )
+
+        # --- Month/Year Navigation Controls with Arrow Icons ---
+        st.markdown("""
+        <style>
+        .nav-button {
+            background-color: #333;
+            color: #BDBDBD;
+            border: none;
+            border-radius: 5px;
+            padding: 10px 15px;
+            font-size: 18px;
+            cursor: pointer;
+            width: 100%;
+            transition: background-color 0.3s, color 0.3s;
+        }
+        .nav-button:hover {
+            background-color: #424242;
+            color: white;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            if st.button("⟪", key="prev_year", use_container_width=True, help="Previous Year"):
+                st.session_state.selected_date = st.session_state.selected_date.replace(year=st.session_state.selected_date.year - 1)
+                st.session_state.png_file = None
+                st.rerun()
+
+        with col2:
+            if st.button("◀", key="prev_month", use_container_width=True, help="Previous Month"):
+                sd = st.session_state.selected_date
+                st.session_state.selected_date = (sd.replace(day=1) - timedelta(days=1)).replace(day=1)
+                st.session_state.png_file = None
+                st.rerun()
+
+        with col3:
+            if st.button("Today", key="today", use_container_width=True):
+                st.session_state.selected_date = datetime.now()
+                st.session_state.png_file = None
+                st.rerun()
+
+        with col4:
+            if st.button("▶", key="next_month", use_container_width=True, help="Next Month"):
+                sd = st.session_state.selected_date
+                next_month = (sd.replace(day=28) + timedelta(days=4)).replace(day=1)
+                st.session_state.selected_date = next_month
+                st.session_state.png_file = None
+                st.rerun()
+
+        with col5:
+            if st.button("⟫", key="next_year", use_container_width=True, help="Next Year"):
+                st.session_state.selected_date = st.session_state.selected_date.replace(year=st.session_state.selected_date.year + 1)
+                st.session_state.png_file = None
+                st.rerun()
+
+        # --- Calendar Display ---
+        if st.toggle("Show full year", key="year_view"):
+            html_code = render_year_calendar_html(daily_stats_df, selected_year, currency_symbol)
+        else:
+            html_code = render_calendar_html(daily_stats_df, selected_year, selected_month, currency_symbol)
+        components.html(html_code, height=800, scrolling=True)
+    else:
+        st.warning("No trading history found for the selected date range.")
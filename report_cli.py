@@ -0,0 +1,114 @@
+"""Builds the dashboard reports for one or many MT5 accounts without a browser or Streamlit server.
+
+Run from the repository root:
+
+    python report_cli.py --login 1234 --password secret --server Broker-Demo --path "C:/MT5/Demo/terminal64.exe"
+    python report_cli.py --accounts accounts.json --range 2024-01-01:2024-06-30 --range 2024-07-01:2024-12-31
+    python report_cli.py --accounts accounts.json --format json,parquet --out /data/reports
+
+Each account is synced once over the union of the requested ranges in its own
+worker process and terminal (see utils.multi_account), then every range is
+sliced from that history. Output goes to <out>/<account>/<from>_<to>/ as
+metrics.json plus one file per table, and <out>/summary holds one row of
+metrics per account and range. Reports are JSON by default; Parquet output is opt-in and needs
+pyarrow (or fastparquet) installed. The run exits with status 1 when any
+account could not be fetched.
+"""
+import argparse
+import importlib.util
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+from utils.data_processing import prepare_deals_frame
+from utils.multi_account import ACCOUNTS_FILE, MAX_TERMINALS, load_accounts, iter_account_histories, from_columnar
+from utils.report import REPORT_FORMATS, build_report, write_report, write_table
+
+DEFAULT_DAYS = 730
+# Parquet is optional: pandas writes it through either of these packages
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+def _parse_range(text):
+    """'YYYY-MM-DD:YYYY-MM-DD' -> (first day, last day), both inclusive."""
+    try:
+        start, end = (date.fromisoformat(part) for part in text.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FROM:TO dates (YYYY-MM-DD:YYYY-MM-DD), got {text!r}")
+    if start > end:
+        raise argparse.ArgumentTypeError(f"range starts after it ends: {text!r}")
+    return start, end
+
+def _directory_name(name):
+    """Account name made safe for use as a directory."""
+    return re.sub(r'[^\w.@-]+', '_', name)
+
+def _slice_range(deals_df, start, end):
+    """Rows of a time-sorted deal frame inside the inclusive day range."""
+    times = deals_df['time'].to_numpy()
+    lo, hi = times.searchsorted([pd.Timestamp(start).to_datetime64(), pd.Timestamp(end + timedelta(days=1)).to_datetime64()])
+    return deals_df.iloc[lo:hi]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--accounts', help=f'account list JSON (default {ACCOUNTS_FILE} when --login is not given)')
+    source.add_argument('--login', type=int, help='single account login')
+    parser.add_argument('--password', help='password for --login')
+    parser.add_argument('--server', help='trade server for --login')
+    parser.add_argument('--path', help='terminal executable for --login (its own, not a terminal in use elsewhere)')
+    parser.add_argument('--range', dest='ranges', action='append', type=_parse_range,
+                        help=f'FROM:TO day range, repeatable (default: the last {DEFAULT_DAYS} days)')
+    parser.add_argument('--format', default='json', help='comma-separated subset of ' + ', '.join(REPORT_FORMATS) + ' (parquet needs pyarrow)')
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--workers', type=int, default=MAX_TERMINALS, help='terminals to run at once')
+    args = parser.parse_args(argv)
+
+    formats = [f.strip().lower() for f in args.format.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in REPORT_FORMATS]
+    if unknown or not formats:
+        parser.error(f"unknown formats: {', '.join(unknown) or '(none)'}")
+    if 'parquet' in formats and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        parser.error("--format parquet needs pyarrow or fastparquet (pip install pyarrow)")
+    if args.login is not None:
+        if not args.server or not args.path:
+            parser.error("--server and --path are required with --login")
+        accounts = [{'login': args.login, 'password': args.password, 'server': args.server,
+                     'path': args.path, 'name': f'{args.login}@{args.server}'}]
+    else:
+        try:
+            accounts = load_accounts(args.accounts or ACCOUNTS_FILE)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"could not read the account list: {e}")
+    ranges = args.ranges or [(date.today() - timedelta(days=DEFAULT_DAYS), date.today())]
+
+    from_date = datetime.combine(min(start for start, _ in ranges), datetime.min.time())
+    to_date = datetime.combine(max(end for _, end in ranges), datetime.max.time())
+    failed = False
+    summary = []
+    for result in iter_account_histories(accounts, from_date, to_date, args.workers):
+        if result['error']:
+            print(f"{result['name']}: {result['error']}", file=sys.stderr)
+            failed = True
+            continue
+        deals_df = prepare_deals_frame(from_columnar(result['columns']))
+        for start, end in ranges:
+            report = build_report(_slice_range(deals_df, start, end))
+            label = f'{start}_{end}'
+            if report is None:
+                print(f"{result['name']} {label}: no deals")
+                continue
+            write_report(report, os.path.join(args.out, _directory_name(result['name']), label), formats)
+            summary.append({'account': result['name'], 'from': start.isoformat(), 'to': end.isoformat(), **report['metrics']})
+            print(f"{result['name']} {label}: {report['metrics']['total_trades']:,} trades, "
+                  f"net profit {report['metrics']['net_profit']:,.2f}")
+
+    if summary:
+        os.makedirs(args.out, exist_ok=True)
+        for fmt in formats:
+            write_table(pd.DataFrame(summary), os.path.join(args.out, 'summary'), fmt)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Tests import the app modules from the repository root and never need a terminal
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('MT5_BACKEND', 'synthetic')
+
+from utils.synthetic_deals import generate_deals
+from utils.data_processing import prepare_deals_frame
+
+SYNTHETIC_DEALS = 20_000
+
+@pytest.fixture(scope='session')
+def deals_df():
+    """Dashboard deal frame built from the synthetic generator with a fixed seed and end date."""
+    columns = generate_deals(SYNTHETIC_DEALS, seed=7)
+    columns.pop('is_open')
+    return prepare_deals_frame(pd.DataFrame(columns))
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from utils import deal_store
+from utils.deal_store import TAIL_OVERLAP, load_deals, sync_deals
+from utils.mt5_backend import mt5
+
+LOGIN, SERVER = 4242, 'Synthetic-Server'
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Empty deal store in a temporary directory, with the synthetic account logged in."""
+    monkeypatch.setattr(deal_store, 'STORE_DIR', str(tmp_path))
+    mt5.initialize()
+    mt5.login(LOGIN, 'x', SERVER)
+    return tmp_path
+
+def terminal_tickets(from_date, to_date):
+    return [deal.ticket for deal in mt5.history_deals_get(from_date, to_date)]
+
+def stored_tickets(from_date, to_date):
+    return load_deals(LOGIN, SERVER, from_date, to_date)['ticket'].tolist()
+
+def assert_store_matches(from_date, to_date):
+    tickets = stored_tickets(from_date, to_date)
+    assert len(tickets) == len(set(tickets))
+    assert sorted(tickets) == sorted(terminal_tickets(from_date, to_date))
+
+def sync_state():
+    conn = deal_store._connect(LOGIN, SERVER)
+    try:
+        return conn.execute("SELECT synced_from, synced_to FROM sync_state").fetchall()
+    finally:
+        conn.close()
+
+def test_first_sync_matches_terminal(store):
+    from_date, to_date = datetime(2025, 3, 1), datetime(2025, 6, 30)
+    sync_deals(LOGIN, SERVER, from_date, to_date)
+    assert stored_tickets(from_date, to_date)
+    assert_store_matches(from_date, to_date)
+    assert sync_state() == [(deal_store._to_ts(from_date), deal_store._to_ts(to_date))]
+
+def test_repeated_and_overlapping_syncs_add_no_duplicates(store):
+    ranges = [
+        (datetime(2025, 3, 1), datetime(2025, 6, 30)),
+        (datetime(2025, 3, 1), datetime(2025, 6, 30)),
+        # Widened backwards, then forwards: the tail is re-fetched from TAIL_OVERLAP before the last sync point
+        (datetime(2025, 1, 1), datetime(2025, 6, 30)),
+        (datetime(2025, 1, 1), datetime(2025, 9, 30)),
+        (datetime(2025, 4, 1), datetime(2025, 10, 15)),
+    ]
+    for from_date, to_date in ranges:
+        sync_deals(LOGIN, SERVER, from_date, to_date)
+        assert_store_matches(from_date, to_date)
+    assert_store_matches(datetime(2025, 1, 1), datetime(2025, 10, 15))
+    assert sync_state() == [(deal_store._to_ts(datetime(2025, 1, 1)), deal_store._to_ts(datetime(2025, 10, 15)))]
+
+def test_tail_sync_requests_the_overlap(store, monkeypatch):
+    sync_deals(LOGIN, SERVER, datetime(2025, 1, 1), datetime(2025, 6, 30))
+    requests = []
+    history_deals_get = mt5.history_deals_get
+    def recording(from_date, to_date):
+        requests.append((from_date, to_date))
+        return history_deals_get(from_date, to_date)
+    monkeypatch.setattr(mt5, 'history_deals_get', recording)
+    sync_deals(LOGIN, SERVER, datetime(2025, 1, 1), datetime(2025, 7, 31))
+    assert requests == [(datetime(2025, 6, 30) - TAIL_OVERLAP, datetime(2025, 7, 31))]
+    assert_store_matches(datetime(2025, 1, 1), datetime(2025, 7, 31))
+
+def test_failed_request_leaves_the_range_unsynced(store, monkeypatch):
+    from_date, to_date = datetime(2025, 3, 1), datetime(2025, 6, 30)
+    history_deals_get = mt5.history_deals_get
+    monkeypatch.setattr(mt5, 'history_deals_get', lambda *args: None)
+    sync_deals(LOGIN, SERVER, from_date, to_date)
+    assert sync_state() == []
+    assert stored_tickets(from_date, to_date) == []
+
+    monkeypatch.setattr(mt5, 'history_deals_get', history_deals_get)
+    sync_deals(LOGIN, SERVER, from_date, to_date)
+    # The terminal fails again for both the older history and the tail
+    monkeypatch.setattr(mt5, 'history_deals_get', lambda *args: None)
+    sync_deals(LOGIN, SERVER, datetime(2025, 1, 1), datetime(2025, 9, 30))
+    assert sync_state() == [(deal_store._to_ts(from_date), deal_store._to_ts(to_date))]
+
+    monkeypatch.setattr(mt5, 'history_deals_get', history_deals_get)
+    sync_deals(LOGIN, SERVER, datetime(2025, 1, 1), datetime(2025, 9, 30))
+    assert_store_matches(datetime(2025, 1, 1), datetime(2025, 9, 30))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from utils.deal_schema import DEAL_TYPE_BUY, DEAL_TYPE_SELL
+from utils.downsampling import balance_curve, downsample_series, lttb
+
+def reference_lttb(x, y, threshold):
+    """Point-by-point Largest-Triangle-Three-Buckets over the same bucket edges."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    buckets = threshold - 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    selected = [0]
+    a = 0
+    for i in range(buckets):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < buckets:
+            next_rows = range(edges[i + 1], edges[i + 2])
+            next_x = sum(x[j] for j in next_rows) / len(next_rows)
+            next_y = sum(y[j] for j in next_rows) / len(next_rows)
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - next_x) * (y[j] - y[a]) - (x[a] - x[j]) * (next_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+@pytest.mark.parametrize('n, threshold', [(1000, 50), (1000, 3), (997, 101), (5000, 2000)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n + threshold)
+    x = np.cumsum(rng.integers(1, 100, n)).astype(np.float64)
+    y = np.cumsum(rng.normal(size=n))
+    np.testing.assert_array_equal(lttb(x, y, threshold), reference_lttb(x, y, threshold))
+
+def test_lttb_keeps_short_series():
+    np.testing.assert_array_equal(lttb(np.arange(10.0), np.arange(10.0), 10), np.arange(10))
+    np.testing.assert_array_equal(lttb(np.arange(10.0), np.arange(10.0), 2), np.arange(10))
+
+def test_lttb_keeps_spikes():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    assert 437 in lttb(x, y, 20)
+
+def test_balance_curve_is_running_sum_of_all_cash_flows(deals_df):
+    times, balance = balance_curve(deals_df)
+    ordered = deals_df.sort_values('time', kind='stable')
+    change = ordered['profit'] + ordered['commission'] + ordered['swap'] + ordered['fee']
+    np.testing.assert_array_equal(times, ordered['time'].to_numpy())
+    np.testing.assert_allclose(balance, change.cumsum().to_numpy())
+
+def test_trade_curve_leaves_out_balance_deals(deals_df):
+    trades = deals_df[deals_df['type'].isin([DEAL_TYPE_BUY, DEAL_TYPE_SELL])]
+    assert len(trades) < len(deals_df)
+    times, trade_pl = balance_curve(deals_df, trades_only=True)
+    assert len(times) == len(trades)
+    balance_deals = deals_df[~deals_df['type'].isin([DEAL_TYPE_BUY, DEAL_TYPE_SELL])]
+    _, balance = balance_curve(deals_df)
+    assert balance[-1] - trade_pl[-1] == pytest.approx(balance_deals['profit'].sum())
+
+def test_downsample_series_window(deals_df):
+    times, balance = balance_curve(deals_df)
+    window = (times[len(times) // 4], times[len(times) // 2])
+    kept_times, kept = downsample_series(times, balance, budget=200, window=window)
+    assert len(kept_times) == 200
+    # One point either side of the window so the line reaches the chart edges
+    assert kept_times[0] <= window[0] and kept_times[-1] >= window[1]
+    assert np.isin(kept, balance).all()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from utils.downsampling import balance_curve
+from utils.drawdown import absolute_drawdown, analyze_drawdowns
+
+def reference_episodes(balance):
+    """(peak row, trough row, recovery row or None, depth) per episode, walking the curve once."""
+    episodes = []
+    peak_row, trough_row = 0, None
+    for i in range(1, len(balance)):
+        if balance[i] >= balance[peak_row]:
+            if trough_row is not None:
+                episodes.append((peak_row, trough_row, i, balance[peak_row] - balance[trough_row]))
+                trough_row = None
+            peak_row = i
+        elif trough_row is None or balance[i] < balance[trough_row]:
+            trough_row = i
+    if trough_row is not None:
+        episodes.append((peak_row, trough_row, None, balance[peak_row] - balance[trough_row]))
+    return episodes
+
+def assert_episodes_match(times, balance):
+    result = analyze_drawdowns(times, balance)
+    expected = sorted(reference_episodes(balance), key=lambda episode: -episode[3])
+    episodes = result['episodes']
+    assert len(episodes) == len(expected)
+    np.testing.assert_allclose(episodes['depth'], [depth for *_, depth in expected])
+    # Equal depths may be listed in either order, so compare the rows as sets
+    rows = {(p, t, r) for p, t, r, _ in expected}
+    index = {time: row for row, time in enumerate(times)}
+    found = {
+        (index[peak], index[trough], None if not recovered else index[recovery])
+        for peak, trough, recovery, recovered in episodes[['peak_time', 'trough_time', 'recovery_time', 'recovered']].itertuples(index=False)
+    }
+    assert found == rows
+    np.testing.assert_allclose(result['peak'], np.maximum.accumulate(balance))
+    np.testing.assert_allclose(result['underwater'], balance - np.maximum.accumulate(balance))
+
+def test_episodes_match_reference_on_synthetic_history(deals_df):
+    times, trade_pl = balance_curve(deals_df, trades_only=True)
+    # Distinct times let episode rows be recovered from their timestamps
+    times = np.datetime64('2025-01-01') + np.arange(len(trade_pl)).astype('timedelta64[m]')
+    assert_episodes_match(times, trade_pl)
+
+def test_repeated_trough_and_open_episode():
+    balance = np.array([100.0, 90.0, 80.0, 95.0, 80.0, 100.0, 110.0, 105.0, 110.0, 120.0, 90.0, 95.0])
+    times = np.datetime64('2025-01-01') + np.arange(len(balance)).astype('timedelta64[D]')
+    assert_episodes_match(times, balance)
+    episodes = analyze_drawdowns(times, balance)['episodes']
+    assert episodes['depth'].tolist() == [30.0, 20.0, 5.0]
+    deepest = episodes.iloc[0]
+    assert not deepest['recovered'] and deepest['duration'] == times[-1] - times[9]
+    # The first of two equal lows is the trough
+    assert episodes.iloc[1]['trough_time'] == times[2]
+
+def test_no_drawdown():
+    times = np.datetime64('2025-01-01') + np.arange(4).astype('timedelta64[D]')
+    result = analyze_drawdowns(times, np.array([1.0, 2.0, 2.0, 3.0]))
+    assert result['episodes'].empty
+    assert not result['underwater'].any()
+    assert analyze_drawdowns(times[:0], np.zeros(0))['episodes'].empty
+
+def test_absolute_drawdown():
+    assert absolute_drawdown(np.array([95.0, 110.0]), 100.0) == pytest.approx(5.0)
+    assert absolute_drawdown(np.array([105.0, 110.0]), 100.0) == 0.0
+    assert absolute_drawdown(np.zeros(0), 100.0) == 0.0
@@ -0,0 +1,51 @@
+import time
+
+from utils import live_updates
+from utils.live_updates import LivePoller
+from utils.mt5_backend import mt5
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_poller_runs_only_while_subscribed(monkeypatch):
+    monkeypatch.setattr(live_updates, 'SUBSCRIBER_MIN_LEASE', 0.2)
+    poller = LivePoller()
+    poller.subscribe('a', 0.02)
+    thread = poller._thread
+    assert thread.is_alive()
+    # One session leaving does not stop the poller for another
+    poller.subscribe('b', 0.02)
+    poller.unsubscribe('a')
+    time.sleep(0.1)
+    assert thread.is_alive() and poller._thread is thread
+    poller.unsubscribe('b')
+    assert wait_for(lambda: not thread.is_alive())
+    assert poller._thread is None
+
+def test_expired_lease_stops_the_poller(monkeypatch):
+    monkeypatch.setattr(live_updates, 'SUBSCRIBER_MIN_LEASE', 0.1)
+    poller = LivePoller().subscribe('page', 0.02)
+    thread = poller._thread
+    assert wait_for(lambda: not thread.is_alive())
+    # Rendering again restarts it
+    poller.subscribe('page', 0.02)
+    assert poller._thread.is_alive()
+    poller.unsubscribe('page')
+
+def test_polls_wait_for_other_terminal_calls(monkeypatch):
+    monkeypatch.setattr(live_updates, 'SUBSCRIBER_MIN_LEASE', 0.5)
+    mt5.initialize()
+    mt5.login(1, 'x', 'Synthetic')
+    poller = LivePoller()
+    with mt5.lock:
+        poller.subscribe('page', 0.02)
+        time.sleep(0.1)
+        # The poller thread is blocked on the terminal lock held by this thread
+        assert poller.snapshot()['account'] is None
+    assert wait_for(lambda: poller.snapshot()['account'] is not None)
+    poller.unsubscribe('page')
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_processing import calculate_trading_metrics
+from utils.deal_schema import DEAL_ENTRY_IN, DEAL_ENTRY_OUT
+from utils.metrics_engine import MetricsAccumulator, compute_trading_metrics
+
+def reference_metrics(deals_df):
+    """The original pandas/loop implementation of calculate_trading_metrics."""
+    exit_trades = deals_df[deals_df['entry'] == DEAL_ENTRY_OUT].copy()
+    if exit_trades.empty:
+        return {}
+    total_trades = len(exit_trades)
+    winning_trades = exit_trades[exit_trades['profit'] > 0]
+    losing_trades = exit_trades[exit_trades['profit'] < 0]
+    gross_profit = winning_trades['profit'].sum() if not winning_trades.empty else 0
+    gross_loss = abs(losing_trades['profit'].sum()) if not losing_trades.empty else 0
+    net_profit = gross_profit - gross_loss
+    exit_trades_sorted = exit_trades.sort_values('time', kind='stable')
+    cumulative_profit = exit_trades_sorted['profit'].cumsum()
+    drawdown = cumulative_profit - cumulative_profit.expanding().max()
+    max_drawdown = abs(drawdown.min())
+    daily_returns = exit_trades.groupby(exit_trades['time'].dt.date)['profit'].sum()
+    if len(daily_returns) > 1 and daily_returns.std() > 0:
+        sharpe_ratio = daily_returns.mean() / daily_returns.std() * np.sqrt(252)
+    else:
+        sharpe_ratio = 0
+
+    consecutive_wins, consecutive_losses = [], []
+    current_win_streak = current_loss_streak = 0
+    for profit in exit_trades_sorted['profit']:
+        if profit > 0:
+            current_win_streak += 1
+            if current_loss_streak > 0:
+                consecutive_losses.append(current_loss_streak)
+                current_loss_streak = 0
+        elif profit < 0:
+            current_loss_streak += 1
+            if current_win_streak > 0:
+                consecutive_wins.append(current_win_streak)
+                current_win_streak = 0
+    if current_win_streak > 0:
+        consecutive_wins.append(current_win_streak)
+    if current_loss_streak > 0:
+        consecutive_losses.append(current_loss_streak)
+
+    short_trades = exit_trades[exit_trades['type'] == 1]
+    short_wins = short_trades[short_trades['profit'] > 0]
+    return {
+        'total_trades': total_trades,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'net_profit': net_profit,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0,
+        'expected_payoff': net_profit / total_trades,
+        'win_rate': len(winning_trades) / total_trades * 100,
+        'avg_win': winning_trades['profit'].mean() if not winning_trades.empty else 0,
+        'avg_loss': losing_trades['profit'].mean() if not losing_trades.empty else 0,
+        'largest_win': winning_trades['profit'].max() if not winning_trades.empty else 0,
+        'largest_loss': losing_trades['profit'].min() if not losing_trades.empty else 0,
+        'max_drawdown': max_drawdown,
+        'recovery_factor': net_profit / max_drawdown if max_drawdown > 0 else float('inf') if net_profit > 0 else 0,
+        'sharpe_ratio': sharpe_ratio,
+        'max_consecutive_wins': max(consecutive_wins) if consecutive_wins else 0,
+        'max_consecutive_losses': max(consecutive_losses) if consecutive_losses else 0,
+        'avg_consecutive_wins': np.mean(consecutive_wins) if consecutive_wins else 0,
+        'short_trades_total': len(short_trades),
+        'short_win_rate': len(short_wins) / len(short_trades) * 100 if not short_trades.empty else 0,
+        'cumulative_profit': cumulative_profit.tolist(),
+        'winning_trades_count': len(winning_trades),
+        'losing_trades_count': len(losing_trades),
+    }
+
+def assert_metrics_match(metrics, expected):
+    assert metrics.keys() == expected.keys()
+    for name, value in expected.items():
+        np.testing.assert_allclose(metrics[name], value, rtol=1e-9, atol=1e-6, err_msg=name)
+
+def exit_frame(times, profits, types=None):
+    """Minimal deal frame of exit deals with the given times and profits."""
+    return pd.DataFrame({
+        'time': pd.to_datetime(times),
+        'profit': np.asarray(profits, dtype=np.float64),
+        'type': np.asarray(types if types is not None else [0] * len(profits), dtype=np.int8),
+        'entry': np.full(len(profits), DEAL_ENTRY_OUT, dtype=np.int8),
+    })
+
+def test_matches_reference_on_synthetic_history(deals_df):
+    assert_metrics_match(calculate_trading_metrics(deals_df), reference_metrics(deals_df))
+
+def test_break_even_trades_do_not_break_streaks():
+    deals_df = exit_frame(
+        ['2025-01-01 10:00', '2025-01-01 11:00', '2025-01-01 12:00', '2025-01-02 09:00',
+         '2025-01-02 10:00', '2025-01-03 10:00', '2025-01-03 11:00', '2025-01-04 10:00'],
+        [5.0, 0.0, 3.0, -2.0, 0.0, -1.0, -4.0, 7.0],
+        [1, 0, 1, 0, 1, 1, 0, 1],
+    )
+    metrics = calculate_trading_metrics(deals_df)
+    assert metrics['max_consecutive_wins'] == 2
+    assert metrics['max_consecutive_losses'] == 3
+    assert_metrics_match(metrics, reference_metrics(deals_df))
+
+def test_unsorted_exits_are_ordered_by_time():
+    deals_df = exit_frame(
+        ['2025-01-03', '2025-01-01', '2025-01-02', '2025-01-05', '2025-01-04'],
+        [-3.0, 4.0, -6.0, 2.0, 1.0],
+    )
+    metrics = calculate_trading_metrics(deals_df)
+    np.testing.assert_allclose(metrics['cumulative_profit'], [4.0, -2.0, -5.0, -4.0, -2.0])
+    assert metrics['max_drawdown'] == pytest.approx(9.0)
+    assert_metrics_match(metrics, reference_metrics(deals_df))
+
+def test_single_day_has_no_sharpe():
+    metrics = compute_trading_metrics(
+        np.array(['2025-01-01T10', '2025-01-01T11'], dtype='datetime64[ns]'),
+        np.array([1.0, -0.5]),
+        np.array([0, 1]),
+    )
+    assert metrics['sharpe_ratio'] == 0
+
+def test_no_exits_gives_empty_metrics():
+    deals_df = exit_frame(['2025-01-01'], [0.0])
+    deals_df['entry'] = np.int8(DEAL_ENTRY_IN)
+    assert calculate_trading_metrics(deals_df) == {}
+    assert calculate_trading_metrics(deals_df.iloc[:0]) == {}
+
+@pytest.mark.parametrize('chunk', [13, 500, 20_000])
+def test_accumulator_matches_batch_metrics(deals_df, chunk):
+    accumulator = MetricsAccumulator()
+    for start in range(0, len(deals_df), chunk):
+        accumulator.update(deals_df.iloc[start:start + chunk])
+    assert_metrics_match(accumulator.to_dict(), calculate_trading_metrics(deals_df))
+
+def test_accumulator_continues_streaks_and_days_across_updates():
+    deals_df = exit_frame(
+        ['2025-01-01 10:00', '2025-01-01 11:00', '2025-01-01 12:00', '2025-01-02 09:00',
+         '2025-01-02 10:00', '2025-01-03 10:00', '2025-01-03 11:00', '2025-01-04 10:00'],
+        [5.0, 0.0, 3.0, -2.0, 0.0, -1.0, -4.0, 7.0],
+        [1, 0, 1, 0, 1, 1, 0, 1],
+    )
+    accumulator = MetricsAccumulator()
+    for rows in (slice(0, 2), slice(2, 5), slice(5, 6), slice(6, 8)):
+        accumulator.update(deals_df.iloc[rows])
+    assert_metrics_match(accumulator.to_dict(), calculate_trading_metrics(deals_df))
+
+def test_accumulator_rejects_older_deals():
+    accumulator = MetricsAccumulator().update(exit_frame(['2025-01-02'], [1.0]))
+    with pytest.raises(ValueError):
+        accumulator.update(exit_frame(['2025-01-01'], [1.0]))
+
+def test_empty_accumulator_gives_empty_metrics():
+    assert MetricsAccumulator().update(None).to_dict() == {}
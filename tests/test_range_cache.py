@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.range_cache import RangeCache
+
+def minute_deals(end, days):
+    """One deal per minute over the days before end, with increasing tickets."""
+    times = pd.date_range(end=end, periods=days * 24 * 60, freq='min')
+    return pd.DataFrame({'ticket': np.arange(len(times)), 'time': times, 'profit': np.ones(len(times))})
+
+class Loader:
+    """RangeCache loader over a fixed frame that records the ranges it was asked for."""
+
+    def __init__(self, deals_df):
+        self.deals_df = deals_df
+        self.calls = []
+
+    def __call__(self, key, from_date, to_date):
+        self.calls.append((from_date, to_date))
+        times = self.deals_df['time']
+        return self.deals_df[(times >= from_date) & (times <= to_date)].reset_index(drop=True)
+
+def expected_slice(deals_df, from_date, to_date):
+    times = deals_df['time']
+    return deals_df[(times >= pd.Timestamp(from_date).floor('s')) & (times <= pd.Timestamp(to_date).floor('s'))]
+
+def test_widening_reuses_the_window():
+    now = datetime.now().replace(microsecond=0)
+    deals_df = minute_deals(now - timedelta(days=2), 5)
+    loader = Loader(deals_df)
+    cache = RangeCache(loader)
+    first = (now - timedelta(days=4), now - timedelta(days=3))
+    for from_date, to_date in (first, (first[0] + timedelta(hours=1), first[1]), (now - timedelta(days=5), now - timedelta(days=2))):
+        frame = cache.get('account', from_date, to_date)
+        np.testing.assert_array_equal(frame['ticket'], expected_slice(deals_df, from_date, to_date)['ticket'])
+    # The narrower range was a slice; widening loaded only the missing head and tail
+    assert len(loader.calls) == 3
+
+def test_refresh_then_widen_keeps_tickets_unique():
+    now = datetime.now().replace(microsecond=0)
+    deals_df = minute_deals(now, 3)
+    cache = RangeCache(Loader(deals_df), ttl=0)
+    today = now.replace(hour=0, minute=0, second=0)
+    end = today + timedelta(days=1) - timedelta(seconds=1)
+    cache.get('account', today, end)
+    # ttl=0: the open end is reloaded, from no earlier than the start of the window
+    cache.get('account', today, end)
+    frame = cache.get('account', today - timedelta(days=2), end)
+    assert frame['ticket'].is_unique
+    np.testing.assert_array_equal(frame['ticket'], expected_slice(deals_df, today - timedelta(days=2), end)['ticket'])
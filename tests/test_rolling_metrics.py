@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from utils.deal_schema import DEAL_ENTRY_OUT
+from utils.metrics_engine import TRADING_DAYS_PER_YEAR
+from utils.rolling_metrics import ROLLING_METRICS, rolling_calendar_metrics, rolling_trade_metrics, sliding_max
+
+def window_metrics(profit, trades, wins, active_profit, equity, annualization):
+    """One window's metrics from its per-unit arrays, computed directly."""
+    gross_win = profit[profit > 0].sum()
+    gross_loss = -profit[profit < 0].sum()
+    sharpe = 0.0
+    if len(active_profit) > 1 and active_profit.std(ddof=1) > 0:
+        sharpe = active_profit.mean() / active_profit.std(ddof=1) * annualization
+    return {
+        'sharpe': sharpe,
+        'win_rate': wins / trades * 100 if trades else np.nan,
+        'profit_factor': gross_win / gross_loss if gross_loss > 0 else np.nan,
+        'expectancy': profit.sum() / trades if trades else np.nan,
+        'drawdown': equity[-1] - equity.max(),
+    }
+
+def assert_rolling_match(results, expected):
+    for window, metrics in expected.items():
+        for name in ROLLING_METRICS:
+            np.testing.assert_allclose(results[window][name], metrics[name], rtol=1e-7, atol=1e-7,
+                                       err_msg=f'{name} over {window}')
+
+@pytest.mark.parametrize('window', [1, 2, 5, 64, 999, 1000, 1001])
+def test_sliding_max_matches_brute_force(window):
+    values = np.random.default_rng(window).normal(size=1000)
+    expected = np.full(len(values), np.nan)
+    for end in range(window - 1, len(values)):
+        expected[end] = values[end - window + 1:end + 1].max()
+    np.testing.assert_array_equal(sliding_max(values, window), expected)
+
+def test_rolling_trade_metrics_match_naive_windows(deals_df):
+    profits = deals_df['profit'].to_numpy()[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT][:3000]
+    windows = (20, 50, 250)
+    equity = np.cumsum(profits)
+    expected = {}
+    for window in windows:
+        rows = [{name: np.nan for name in ROLLING_METRICS}] * (window - 1)
+        for end in range(window, len(profits) + 1):
+            chunk = profits[end - window:end]
+            rows.append(window_metrics(chunk, window, np.count_nonzero(chunk > 0), chunk, equity[end - window:end], 1.0))
+        expected[window] = {name: [row[name] for row in rows] for name in ROLLING_METRICS}
+    assert_rolling_match(rolling_trade_metrics(profits, windows), expected)
+
+def test_rolling_calendar_metrics_match_naive_windows(deals_df):
+    exits = deals_df[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT].iloc[:3000]
+    times = exits['time'].to_numpy()
+    profits = exits['profit'].to_numpy()
+    windows = (7, 30)
+    calendar, results = rolling_calendar_metrics(times, profits, windows)
+
+    days = times.astype('datetime64[D]')
+    assert calendar[0] == days.min() and calendar[-1] == days.max()
+    assert len(calendar) == (days.max() - days.min()).astype(int) + 1
+    daily = np.array([profits[days == day].sum() for day in calendar])
+    equity = np.cumsum(daily)
+    expected = {}
+    for window in windows:
+        rows = [{name: np.nan for name in ROLLING_METRICS}] * (window - 1)
+        for end in range(window, len(calendar) + 1):
+            in_window = (days >= calendar[end - window]) & (days <= calendar[end - 1])
+            chunk = profits[in_window]
+            window_days = calendar[end - window:end]
+            active = daily[end - window:end][np.isin(window_days, days[in_window])]
+            rows.append(window_metrics(chunk, len(chunk), np.count_nonzero(chunk > 0), active,
+                                       equity[end - window:end], np.sqrt(TRADING_DAYS_PER_YEAR)))
+        expected[window] = {name: [row[name] for row in rows] for name in ROLLING_METRICS}
+    assert_rolling_match(results, expected)
+
+def test_windows_longer_than_history_are_empty():
+    results = rolling_trade_metrics([1.0, -2.0, 3.0], (5,))
+    for name in ROLLING_METRICS:
+        assert np.isnan(results[5][name]).all()
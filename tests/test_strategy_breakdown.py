@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from utils.data_processing import calculate_trading_metrics
+from utils.deal_schema import DEAL_ENTRY_IN
+from utils.strategy_breakdown import BREAKDOWN_GROUPINGS, strategy_breakdown
+
+ADDITIVE_METRICS = (
+    'total_trades', 'net_profit', 'gross_profit', 'gross_loss',
+    'winning_trades_count', 'losing_trades_count', 'short_trades_total',
+)
+
+@pytest.mark.parametrize('by', BREAKDOWN_GROUPINGS.values())
+def test_groups_match_per_group_metrics(deals_df, by):
+    breakdown = strategy_breakdown(deals_df, by)
+    assert not breakdown.duplicated(list(by)).any()
+    groups = dict(list(deals_df.groupby(list(by), observed=True)))
+    for row in breakdown.itertuples(index=False):
+        key = tuple(getattr(row, column) for column in by)
+        expected = calculate_trading_metrics(groups[key])
+        for name, value in expected.items():
+            if name != 'cumulative_profit':
+                np.testing.assert_allclose(getattr(row, name), value, rtol=1e-9, atol=1e-6, err_msg=f'{name} for {key}')
+
+@pytest.mark.parametrize('by', BREAKDOWN_GROUPINGS.values())
+def test_groups_sum_to_totals(deals_df, by):
+    breakdown = strategy_breakdown(deals_df, by)
+    totals = calculate_trading_metrics(deals_df)
+    for name in ADDITIVE_METRICS:
+        assert breakdown[name].sum() == pytest.approx(totals[name]), name
+    assert breakdown['net_profit'].is_monotonic_decreasing
+
+def test_no_exits_gives_empty_breakdown(deals_df):
+    entries = deals_df[deals_df['entry'] == DEAL_ENTRY_IN]
+    assert strategy_breakdown(entries, ('symbol',)).empty
+    assert list(strategy_breakdown(None, ('symbol', 'magic')).columns) == ['symbol', 'magic']
@@ -0,0 +1,131 @@
+import asyncio
+import atexit
+import calendar
+import io
+import os
+import threading
+import zipfile
+from utils.data_processing import calculate_monthly_stats
+from utils.calendar_renderer import generate_exportable_html
+
+EXPORT_SIZE = (1200, 1400)
+# Concurrent pages rendered by the shared browser
+EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', 4))
+
+def month_range(start_year, start_month, end_year, end_month):
+    """Lists (year, month) pairs from the start month to the end month inclusive."""
+    months = []
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def build_month_reports(daily_stats_df, months):
+    """Computes the monthly stats block and file name for each (year, month)."""
+    return [
+        {
+            'year': year,
+            'month': month,
+            'stats': calculate_monthly_stats(daily_stats_df, year, month),
+            'name': f"report_{year}_{calendar.month_abbr[month]}.png",
+        }
+        for year, month in months
+    ]
+
+class BrowserRenderer:
+    """One headless Chromium kept warm for the lifetime of the process.
+
+    Playwright's async API runs on a private event loop thread, so Streamlit
+    script threads can submit work from anywhere. Renders are spread over a
+    small pool of pages and screenshots come back as PNG bytes without
+    touching the filesystem.
+    """
+
+    def __init__(self, workers=EXPORT_WORKERS, size=EXPORT_SIZE):
+        self.workers = workers
+        self.size = size
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='export-browser', daemon=True)
+        self._thread.start()
+        try:
+            self._run(self._start())
+        except BaseException:
+            # A failed launch must not leave the loop thread running
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            raise
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _start(self):
+        from playwright.async_api import async_playwright
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(
+                executable_path=os.environ.get('CHROME_PATH') or None,
+            )
+        except BaseException:
+            await self._playwright.stop()
+            raise
+        width, height = self.size
+        self._context = await self._browser.new_context(viewport={'width': width, 'height': height})
+        self._pages = asyncio.Queue()
+        for _ in range(self.workers):
+            await self._pages.put(await self._context.new_page())
+
+    async def _screenshot(self, html):
+        page = await self._pages.get()
+        try:
+            await page.set_content(html, wait_until='load')
+            return await page.screenshot(type='png')
+        finally:
+            await self._pages.put(page)
+
+    async def _render_all(self, documents):
+        return await asyncio.gather(*(self._screenshot(html) for html in documents))
+
+    def render_html(self, documents):
+        """Screenshots each HTML document, returning PNG bytes in the same order."""
+        return self._run(self._render_all(list(documents)))
+
+    def render_reports(self, reports, daily_stats_df, currency_symbol):
+        """Renders monthly reports through generate_exportable_html."""
+        return self.render_html(
+            generate_exportable_html(r['stats'], daily_stats_df, r['year'], r['month'], currency_symbol)
+            for r in reports
+        )
+
+    async def _stop(self):
+        await self._browser.close()
+        await self._playwright.stop()
+
+    def close(self):
+        """Shuts the browser down and stops the event loop thread."""
+        self._run(self._stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+_renderer_lock = threading.Lock()
+_renderer = None
+
+def get_browser_renderer():
+    """Returns the process-wide browser renderer, launching it on first use."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = BrowserRenderer()
+            atexit.register(_renderer.close)
+        return _renderer
+
+def export_months_zip(daily_stats_df, months, currency_symbol, renderer=None):
+    """Renders a PNG report for every (year, month) and returns them as zip bytes."""
+    renderer = renderer or get_browser_renderer()
+    reports = build_month_reports(daily_stats_df, months)
+    images = renderer.render_reports(reports, daily_stats_df, currency_symbol)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for report, image in zip(reports, images):
+            archive.writestr(report['name'], image)
+    return buffer.getvalue()
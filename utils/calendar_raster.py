@@ -0,0 +1,149 @@
+import calendar
+import io
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from utils.calendar_renderer import build_daily_index
+
+# Same palette and geometry as the HTML export
+BACKGROUND = '#0E1117'
+PANEL = '#1e1e1e'
+HEADER = '#333333'
+EMPTY = '#121212'
+GREEN = '#2e7d32'
+RED = '#b71c1c'
+NEUTRAL = '#424242'
+GREY = '#9E9E9E'
+LIGHT_GREY = '#BDBDBD'
+WHITE = '#FFFFFF'
+
+EXPORT_SIZE = (1200, 1400)
+PADDING = 20
+GAP = 5
+RADIUS = 5
+HEADER_HEIGHT = 38
+DAY_HEIGHT = 100
+WEEK_COLUMN_WIDTH = 140
+STATS_HEIGHT = 170
+
+_REGULAR_FONTS = ('arial.ttf', 'DejaVuSans.ttf', 'LiberationSans-Regular.ttf')
+_BOLD_FONTS = ('arialbd.ttf', 'DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf')
+
+@lru_cache(maxsize=None)
+def _font(size, bold=False):
+    """Loads the first available sans font at the given pixel size."""
+    for name in _BOLD_FONTS if bold else _REGULAR_FONTS:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+def _color_for(value):
+    return GREEN if value > 0 else (RED if value < 0 else NEUTRAL)
+
+def _text_color_for(value):
+    return GREEN if value > 0 else (RED if value < 0 else GREY)
+
+def _centered(draw, center_x, y, text, font, fill):
+    draw.text((center_x, y), text, font=font, fill=fill, anchor='mt')
+
+def _delta_marker(draw, x, y, size, change, fill):
+    """Draws the up/down/flat marker as a shape so it does not depend on font glyphs."""
+    if change > 0:
+        draw.polygon([(x, y + size), (x + size, y + size), (x + size / 2, y)], fill=fill)
+    elif change < 0:
+        draw.polygon([(x, y), (x + size, y), (x + size / 2, y + size)], fill=fill)
+    else:
+        draw.ellipse([x, y, x + size, y + size], fill=fill)
+
+def _draw_stats_block(draw, stats, year, month, currency_symbol, width):
+    left, top = PADDING, PADDING
+    draw.rounded_rectangle([left, top, width - PADDING, top + STATS_HEIGHT], radius=10, fill=PANEL)
+    _centered(draw, width / 2, top + 25, f"{calendar.month_name[month]} {year}", _font(32, bold=True), WHITE)
+
+    change = stats['percentage_change']
+    columns = [
+        ('Monthly P/L', f"{currency_symbol}{stats['current_profit']:,.2f}", _text_color_for(stats['current_profit']), 29),
+        ('Total Trades', f"{stats['total_trades']}", WHITE, 29),
+        ('vs. Previous Month', f"{abs(change):.1f}%", _text_color_for(change), 22),
+    ]
+    column_width = 280
+    start_x = width / 2 - column_width * len(columns) / 2
+    for i, (label, value, color, size) in enumerate(columns):
+        center_x = start_x + column_width * (i + 0.5)
+        _centered(draw, center_x, top + 80, label, _font(18), LIGHT_GREY)
+        value_font = _font(size, bold=True)
+        if i == 2:
+            text_width = draw.textlength(value, font=value_font)
+            marker = size * 0.7
+            marker_x = center_x - (text_width + marker + 8) / 2
+            text_top, text_bottom = draw.textbbox((0, top + 112), value, font=value_font)[1::2]
+            _delta_marker(draw, marker_x, (text_top + text_bottom - marker) / 2, marker, change, color)
+            draw.text((marker_x + marker + 8, top + 112), value, font=value_font, fill=color)
+        else:
+            _centered(draw, center_x, top + 110, value, value_font, color)
+
+def _draw_calendar(draw, daily_index, year, month, currency_symbol, top, width):
+    day_width = (width - 2 * PADDING - WEEK_COLUMN_WIDTH - 7 * GAP) / 7
+    column_x = [PADDING + i * (day_width + GAP) for i in range(8)]
+    header_font = _font(14, bold=True)
+    for i, label in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun", "Week Total"]):
+        cell_width = day_width if i < 7 else WEEK_COLUMN_WIDTH
+        draw.rounded_rectangle([column_x[i], top, column_x[i] + cell_width, top + HEADER_HEIGHT], radius=RADIUS, fill=HEADER)
+        _centered(draw, column_x[i] + cell_width / 2, top + 12, label, header_font, WHITE)
+
+    date_font, profit_font, trades_font = _font(19, bold=True), _font(17, bold=True), _font(14)
+    y = top + HEADER_HEIGHT + GAP
+    for week in calendar.Calendar(firstweekday=0).monthdatescalendar(year, month):
+        weekly_profit, weekly_trades = 0.0, 0
+        for i, date_obj in enumerate(week):
+            box = [column_x[i], y, column_x[i] + day_width, y + DAY_HEIGHT]
+            if date_obj.month != month:
+                draw.rounded_rectangle(box, radius=RADIUS, fill=EMPTY)
+                continue
+            profit, trades = daily_index.get(date_obj, (0.0, 0))
+            weekly_profit += profit
+            weekly_trades += trades
+            draw.rounded_rectangle(box, radius=RADIUS, fill=_color_for(profit))
+            draw.text((box[0] + 8, y + 8), str(date_obj.day), font=date_font, fill=LIGHT_GREY)
+            draw.text((box[0] + 8, y + 38), f"{currency_symbol}{profit:,.2f}", font=profit_font, fill=WHITE)
+            draw.text((box[0] + 8, y + 62), f"{int(trades)} trades", font=trades_font, fill=GREY)
+
+        box = [column_x[7], y, column_x[7] + WEEK_COLUMN_WIDTH, y + DAY_HEIGHT]
+        draw.rounded_rectangle(box, radius=RADIUS, fill=_color_for(weekly_profit))
+        center_x = column_x[7] + WEEK_COLUMN_WIDTH / 2
+        _centered(draw, center_x, y + 30, f"{currency_symbol}{weekly_profit:,.2f}", profit_font, WHITE)
+        _centered(draw, center_x, y + 58, f"{int(weekly_trades)} trades", trades_font, GREY)
+        y += DAY_HEIGHT + GAP
+
+def render_report_png(stats, daily_stats_df, year, month, currency_symbol, daily_index=None, size=None):
+    """Draws the monthly stats block and calendar grid straight to PNG bytes, without a browser.
+
+    By default the image is EXPORT_SIZE wide and cropped to the content height,
+    which keeps PNG encoding (the most expensive step) proportional to what is drawn.
+    """
+    if daily_index is None:
+        daily_index = build_daily_index(daily_stats_df)
+    calendar_top = PADDING + STATS_HEIGHT + 20
+    if size is None:
+        weeks = len(calendar.Calendar(firstweekday=0).monthdatescalendar(year, month))
+        size = (EXPORT_SIZE[0], calendar_top + HEADER_HEIGHT + GAP + weeks * (DAY_HEIGHT + GAP) + PADDING)
+    width, height = size
+    image = Image.new('RGB', size, BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    _draw_stats_block(draw, stats, year, month, currency_symbol, width)
+    _draw_calendar(draw, daily_index, year, month, currency_symbol, calendar_top, width)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+class RasterRenderer:
+    """Batch renderer with the same interface as batch_export.BrowserRenderer."""
+
+    def render_reports(self, reports, daily_stats_df, currency_symbol):
+        """Renders monthly reports with Pillow, sharing one date index across all of them."""
+        daily_index = build_daily_index(daily_stats_df)
+        return [
+            render_report_png(r['stats'], daily_stats_df, r['year'], r['month'], currency_symbol, daily_index)
+            for r in reports
+        ]
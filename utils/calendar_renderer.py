@@ -1,12 +1,6 @@
 import calendar
-import pandas as pd
 
-def render_calendar_html(daily_stats, year, month, currency_symbol='$'):
-    """Generates the HTML string for the calendar with weekly totals."""
-    cal = calendar.Calendar(firstweekday=0)
-    month_days = cal.monthdatescalendar(year, month)
-
-    css = """
+CALENDAR_CSS = """
     <style>
         .calendar-container { font-family: Arial, sans-serif; color: white; }
         .calendar-grid { display: grid; grid-template-columns: repeat(7, 1fr) auto; gap: 5px; }
@@ -24,50 +18,79 @@ def render_calendar_html(daily_stats, year, month, currency_symbol='$'):
     </style>
     """
 
-    html_content = '<div class="calendar-grid">'
-    day_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    for day_name in day_labels:
-        html_content += f'<div class="day-header">{day_name}</div>'
-    html_content += '<div class="weekly-header">Week Total</div>'
+YEAR_CSS = """
+    <style>
+        .year-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(560px, 1fr)); gap: 25px; }
+        .month-title { text-align: center; margin: 0 0 10px 0; color: white; }
+        .year-grid .day-box { min-height: 60px; }
+    </style>
+    """
 
-    for week in month_days:
+# Cell templates, filled with str.format and joined once per render
+_HEADER_ROW = ''.join(
+    f'<div class="day-header">{day_name}</div>' for day_name in ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+) + '<div class="weekly-header">Week Total</div>'
+_EMPTY_CELL = '<div class="day-box-empty"></div>'
+_DAY_CELL = (
+    '<div class="day-box {css_class}"><div class="day-date">{day}</div>'
+    '<div class="day-profit">{symbol}{profit:,.2f}</div><div class="day-trades">{trades} trades</div></div>'
+)
+_WEEK_CELL = (
+    '<div class="weekly-total {css_class}"><div>{symbol}{profit:,.2f}</div>'
+    '<div class="weekly-trades">{trades} trades</div></div>'
+)
+_MONTH_BLOCK = '<div class="month-block"><h3 class="month-title">{title}</h3>{grid}</div>'
+
+def _profit_class(profit):
+    return 'green' if profit > 0 else ('red' if profit < 0 else 'neutral')
+
+def build_daily_index(daily_stats):
+    """Maps each date in the daily stats to its (profit, trades) pair."""
+    if daily_stats is None or daily_stats.empty:
+        return {}
+    dates = daily_stats['Date'].dt.date.tolist()
+    return dict(zip(dates, zip(daily_stats['Profit'].tolist(), daily_stats['Trades'].tolist())))
+
+def _render_month_grid(daily_index, year, month, currency_symbol):
+    """Renders one month of day cells plus weekly totals from a date index."""
+    parts = ['<div class="calendar-grid">', _HEADER_ROW]
+    for week in calendar.Calendar(firstweekday=0).monthdatescalendar(year, month):
         weekly_profit = 0.0
         weekly_trades = 0
         for date_obj in week:
             if date_obj.month != month:
-                html_content += '<div class="day-box-empty"></div>'
-            else:
-                day_data = daily_stats[daily_stats['Date'] == pd.to_datetime(date_obj)]
-                if not day_data.empty:
-                    profit = day_data['Profit'].iloc[0]
-                    trades = day_data['Trades'].iloc[0]
-                    weekly_profit += profit
-                    weekly_trades += trades
-                    profit_class = 'green' if profit > 0 else ('red' if profit < 0 else 'neutral')
-                    profit_text = f"{currency_symbol}{profit:,.2f}"
-                    html_content += f'''
-                    <div class="day-box {profit_class}">
-                        <div class="day-date">{date_obj.day}</div>
-                        <div class="day-profit">{profit_text}</div>
-                        <div class="day-trades">{int(trades)} trades</div>
-                    </div>'''
-                else:
-                    html_content += f'''
-                    <div class="day-box neutral">
-                        <div class="day-date">{date_obj.day}</div>
-                        <div class="day-profit">{currency_symbol}0.00</div>
-                        <div class="day-trades">0 trades</div>
-                    </div>'''
+                parts.append(_EMPTY_CELL)
+                continue
+            profit, trades = daily_index.get(date_obj, (0.0, 0))
+            weekly_profit += profit
+            weekly_trades += trades
+            parts.append(_DAY_CELL.format(
+                css_class=_profit_class(profit), day=date_obj.day,
+                symbol=currency_symbol, profit=profit, trades=int(trades),
+            ))
+        parts.append(_WEEK_CELL.format(
+            css_class=_profit_class(weekly_profit), symbol=currency_symbol,
+            profit=weekly_profit, trades=int(weekly_trades),
+        ))
+    parts.append('</div>')
+    return ''.join(parts)
 
-        total_class = 'green' if weekly_profit > 0 else ('red' if weekly_profit < 0 else 'neutral')
-        html_content += f'''
-        <div class="weekly-total {total_class}">
-            <div>{currency_symbol}{weekly_profit:,.2f}</div>
-            <div class="weekly-trades">{int(weekly_trades)} trades</div>
-        </div>'''
+def render_calendar_html(daily_stats, year, month, currency_symbol='$'):
+    """Generates the HTML string for the calendar with weekly totals."""
+    html_content = _render_month_grid(build_daily_index(daily_stats), year, month, currency_symbol)
+    return f"{CALENDAR_CSS}<div class='calendar-container'>{html_content}</div>"
 
-    html_content += '</div>'
-    return f"{css}<div class='calendar-container'>{html_content}</div>"
+def render_year_calendar_html(daily_stats, year, currency_symbol='$', months=range(1, 13)):
+    """Generates one HTML string with a calendar for every month in months of the given year."""
+    daily_index = build_daily_index(daily_stats)
+    blocks = [
+        _MONTH_BLOCK.format(
+            title=f"{calendar.month_name[month]} {year}",
+            grid=_render_month_grid(daily_index, year, month, currency_symbol),
+        )
+        for month in months
+    ]
+    return f"{CALENDAR_CSS}{YEAR_CSS}<div class='calendar-container'><div class='year-grid'>{''.join(blocks)}</div></div>"
 
 def generate_exportable_html(stats, daily_stats_df, year, month, currency_symbol):
     """Generates a single, self-contained HTML string for PNG export."""
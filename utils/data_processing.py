@@ -1,154 +1,222 @@
-import streamlit as st
-import MetaTrader5 as mt5
+from utils.mt5_backend import mt5
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
+import threading
+import time
+from utils.deal_store import TAIL_OVERLAP, sync_deals, load_deals
+from utils.metrics_engine import compute_trading_metrics, MetricsAccumulator
+from utils.metrics_cache import cached
+from utils.deal_schema import DEAL_ENTRY_OUT, apply_deal_schema
+from utils.mt5_convert import POSITION_SCHEMA, records_to_frame
+from utils.round_trips import build_round_trips
+from utils.downsampling import balance_curve
+from utils.rollup import build_rollup, rollup
+from utils.range_cache import RangeCache
+from utils.drawdown import analyze_drawdowns
+from utils.rolling_metrics import rolling_trade_metrics, rolling_calendar_metrics
+from utils.strategy_breakdown import strategy_breakdown
+from utils.time_bins import build_time_bins
+
+def _load_history(account, from_date, to_date):
+    """Syncs and loads one account's deals for an inclusive range (RangeCache loader)."""
+    login, server = account
+    sync_deals(login, server, from_date, to_date)
+    return prepare_deals_frame(load_deals(login, server, from_date, to_date))
+
+# Widest loaded window per account; re-syncs the open end every 5 minutes
+_history = RangeCache(_load_history)
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
 def get_trading_history(from_date, to_date):
-    """Fetch trading history from MT5."""
-    deals = mt5.history_deals_get(from_date, to_date)
-    if deals is None or len(deals) == 0:
+    """Fetch trading history, syncing only new deals from MT5 into the local deal store.
+
+    Ranges inside an already loaded window are sliced from it without touching
+    the terminal or the store. The returned frame is shared and read-only.
+    """
+    info = mt5.account_info()
+    if info is None:
+        return None
+    deals_df = _history.get((info.login, info.server), from_date, to_date)
+    if deals_df.empty:
         return None
-    deals_df = pd.DataFrame(list(deals), columns=deals[0]._asdict().keys())
-    deals_df['time'] = pd.to_datetime(deals_df['time'], unit='s')
-    deals_df['entry'] = deals_df['entry'].map({0: 'Entry', 1: 'Exit'})
     return deals_df
 
-@st.cache_data(ttl=300)
+def get_balance_at(to_date, current_balance):
+    """Account balance at the end of a range: current_balance less every balance change after to_date.
+
+    Deal times are on the server clock, so deals are looked up to TAIL_OVERLAP
+    past the local time; a range that ends after that returns current_balance.
+    """
+    now = datetime.now() + TAIL_OVERLAP
+    if to_date >= now:
+        return current_balance
+    later_df = get_trading_history(to_date + timedelta(seconds=1), now)
+    if later_df is None:
+        return current_balance
+    return current_balance - balance_curve(later_df)[1][-1]
+
+def prepare_deals_frame(deals_df):
+    """Converts raw terminal deal columns into the frame used by the dashboard."""
+    return apply_deal_schema(deals_df)
+
+# Last positions snapshot as (monotonic time, frame), reused for POSITIONS_TTL seconds
+POSITIONS_TTL = 300
+_positions = (None, None)
+
 def get_positions():
-    """Get current open positions."""
+    """Get current open positions. The returned frame is shared and read-only."""
+    global _positions
+    fetched_at, positions_df = _positions
+    if fetched_at is not None and time.monotonic() - fetched_at < POSITIONS_TTL:
+        return positions_df
     positions = mt5.positions_get()
-    if positions is None or len(positions) == 0:
-        return None
-    positions_df = pd.DataFrame(list(positions), columns=positions[0]._asdict().keys())
-    positions_df['time'] = pd.to_datetime(positions_df['time'], unit='s')
+    positions_df = None if positions is None or len(positions) == 0 else records_to_frame(positions, POSITION_SCHEMA)
+    _positions = (time.monotonic(), positions_df)
     return positions_df
 
+def get_rollup(deals_df):
+    """Day x symbol x magic x type rollup cube for a deal frame, built once per distinct dataset."""
+    return cached('rollup', deals_df, build_rollup)
+
 def get_daily_stats(deals_df):
     """Aggregates deal data into daily profit/loss and trade counts."""
     if deals_df is None or deals_df.empty:
         return pd.DataFrame()
 
-    daily_stats = deals_df[deals_df['entry'] == 'Exit'].groupby(deals_df['time'].dt.date).agg(
-        Profit=('profit', 'sum'),
-        Trades=('profit', 'count'),
-    ).reset_index()
-    daily_stats.rename(columns={'time': 'Date'}, inplace=True)
-    daily_stats['Date'] = pd.to_datetime(daily_stats['Date'])
+    daily = rollup(get_rollup(deals_df), 'D')
+    daily_stats = pd.DataFrame({
+        'Date': pd.to_datetime(daily['period']),
+        'Profit': daily['profit'],
+        'Trades': daily['trades'].astype(np.int64),
+    })
     return daily_stats
 
+def build_daily_array(daily_stats):
+    """Materializes daily stats into dense day-indexed arrays.
+
+    Returns {'start': first day, 'profit': array, 'trades': array} where element i
+    holds the totals for start + i days; days without exits are zero. Any window of
+    days is then a single slice (see slice_daily_array).
+    """
+    if daily_stats is None or daily_stats.empty:
+        return {'start': None, 'profit': np.zeros(0), 'trades': np.zeros(0, dtype=np.int64)}
+    days = daily_stats['Date'].to_numpy().astype('datetime64[D]')
+    start = days.min()
+    offsets = (days - start).astype(np.int64)
+    profit = np.zeros(offsets.max() + 1)
+    trades = np.zeros(offsets.max() + 1, dtype=np.int64)
+    profit[offsets] = daily_stats['Profit'].to_numpy()
+    trades[offsets] = daily_stats['Trades'].to_numpy()
+    return {'start': start, 'profit': profit, 'trades': trades}
+
+def slice_daily_array(daily_array, first_day, last_day):
+    """Returns (profit, trades) for every day in [first_day, last_day], zero-padded outside the data."""
+    first_day, last_day = np.datetime64(first_day, 'D'), np.datetime64(last_day, 'D')
+    length = int((last_day - first_day).astype(np.int64)) + 1
+    profit = np.zeros(length)
+    trades = np.zeros(length, dtype=np.int64)
+    if daily_array['start'] is None:
+        return profit, trades
+    lo = int((first_day - daily_array['start']).astype(np.int64))
+    src_lo, src_hi = max(lo, 0), min(lo + length, len(daily_array['profit']))
+    if src_lo < src_hi:
+        profit[src_lo - lo:src_hi - lo] = daily_array['profit'][src_lo:src_hi]
+        trades[src_lo - lo:src_hi - lo] = daily_array['trades'][src_lo:src_hi]
+    return profit, trades
+
+def get_daily_array(deals_df):
+    """Dense daily arrays for a deal frame, built once per distinct dataset."""
+    return cached('daily_array', deals_df, lambda df: build_daily_array(get_daily_stats(df)))
+
+def get_time_bins(deals_df):
+    """Symbol x weekday x hour profit, trade and win counts, built once per distinct dataset."""
+    return cached('time_bins', deals_df, build_time_bins)
+
 def calculate_trading_metrics(deals_df):
     """Calculate comprehensive trading metrics."""
     if deals_df is None or deals_df.empty:
         return {}
-    
-    # Filter exit trades only
-    exit_trades = deals_df[deals_df['entry'] == 'Exit'].copy()
-    
-    if exit_trades.empty:
-        return {}
-    
-    # Basic metrics
-    total_trades = len(exit_trades)
-    winning_trades = exit_trades[exit_trades['profit'] > 0]
-    losing_trades = exit_trades[exit_trades['profit'] < 0]
-    
-    gross_profit = winning_trades['profit'].sum() if not winning_trades.empty else 0
-    gross_loss = abs(losing_trades['profit'].sum()) if not losing_trades.empty else 0
-    net_profit = gross_profit - gross_loss
-    
-    # Profit factor
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
-    
-    # Expected payoff
-    expected_payoff = net_profit / total_trades if total_trades > 0 else 0
-    
-    # Win rate
-    win_rate = len(winning_trades) / total_trades * 100 if total_trades > 0 else 0
-    
-    # Average trades
-    avg_win = winning_trades['profit'].mean() if not winning_trades.empty else 0
-    avg_loss = losing_trades['profit'].mean() if not losing_trades.empty else 0
-    
-    # Largest trades
-    largest_win = winning_trades['profit'].max() if not winning_trades.empty else 0
-    largest_loss = losing_trades['profit'].min() if not losing_trades.empty else 0
-    
-    # Calculate drawdown
-    exit_trades_sorted = exit_trades.sort_values('time')
-    cumulative_profit = exit_trades_sorted['profit'].cumsum()
-    running_max = cumulative_profit.expanding().max()
-    drawdown = cumulative_profit - running_max
-    max_drawdown = abs(drawdown.min()) if not drawdown.empty else 0
-    
-    # Recovery factor
-    recovery_factor = net_profit / max_drawdown if max_drawdown > 0 else float('inf') if net_profit > 0 else 0
-    
-    # Sharpe ratio (simplified - using daily returns)
-    daily_returns = exit_trades.groupby(exit_trades['time'].dt.date)['profit'].sum()
-    if len(daily_returns) > 1:
-        sharpe_ratio = daily_returns.mean() / daily_returns.std() * np.sqrt(252) if daily_returns.std() > 0 else 0
-    else:
-        sharpe_ratio = 0
-    
-    # Consecutive wins/losses
-    consecutive_wins = []
-    consecutive_losses = []
-    current_win_streak = 0
-    current_loss_streak = 0
-    
-    for profit in exit_trades_sorted['profit']:
-        if profit > 0:
-            current_win_streak += 1
-            if current_loss_streak > 0:
-                consecutive_losses.append(current_loss_streak)
-                current_loss_streak = 0
-        elif profit < 0:
-            current_loss_streak += 1
-            if current_win_streak > 0:
-                consecutive_wins.append(current_win_streak)
-                current_win_streak = 0
-    
-    # Add final streaks
-    if current_win_streak > 0:
-        consecutive_wins.append(current_win_streak)
-    if current_loss_streak > 0:
-        consecutive_losses.append(current_loss_streak)
-    
-    max_consecutive_wins = max(consecutive_wins) if consecutive_wins else 0
-    max_consecutive_losses = max(consecutive_losses) if consecutive_losses else 0
-    avg_consecutive_wins = np.mean(consecutive_wins) if consecutive_wins else 0
-    
-    # Short trades analysis
-    short_trades = exit_trades[exit_trades['type'] == 1]  # Assuming 1 is sell
-    short_wins = short_trades[short_trades['profit'] > 0] if not short_trades.empty else pd.DataFrame()
-    short_win_rate = len(short_wins) / len(short_trades) * 100 if not short_trades.empty else 0
-    
-    return {
-        'total_trades': total_trades,
-        'gross_profit': gross_profit,
-        'gross_loss': gross_loss,
-        'net_profit': net_profit,
-        'profit_factor': profit_factor,
-        'expected_payoff': expected_payoff,
-        'win_rate': win_rate,
-        'avg_win': avg_win,
-        'avg_loss': avg_loss,
-        'largest_win': largest_win,
-        'largest_loss': largest_loss,
-        'max_drawdown': max_drawdown,
-        'recovery_factor': recovery_factor,
-        'sharpe_ratio': sharpe_ratio,
-        'max_consecutive_wins': max_consecutive_wins,
-        'max_consecutive_losses': max_consecutive_losses,
-        'avg_consecutive_wins': avg_consecutive_wins,
-        'short_trades_total': len(short_trades),
-        'short_win_rate': short_win_rate,
-        'cumulative_profit': cumulative_profit.tolist() if not cumulative_profit.empty else [],
-        'winning_trades_count': len(winning_trades),
-        'losing_trades_count': len(losing_trades)
-    }
+
+    # Filter exit trades only; take() on row positions beats boolean indexing per column
+    exit_rows = np.flatnonzero(deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT)
+    return compute_trading_metrics(
+        deals_df['time'].to_numpy().take(exit_rows),
+        deals_df['profit'].to_numpy(dtype=np.float64).take(exit_rows),
+        deals_df['type'].to_numpy().take(exit_rows),
+    )
+
+# Running accumulators for deal frames that grow at the tail, keyed by first ticket
+MAX_LIVE_ACCUMULATORS = 16
+_live_lock = threading.Lock()
+_live_metrics = {}
+
+def _incremental_metrics(deals_df):
+    """Metrics for deals_df, absorbing only the new rows when it extends the last frame seen."""
+    if deals_df is None or deals_df.empty:
+        return calculate_trading_metrics(deals_df)
+    tickets = deals_df['ticket'].to_numpy()
+    key = int(tickets[0])
+    with _live_lock:
+        live = _live_metrics.pop(key, None)
+        accumulator = None
+        if live and len(tickets) > live['rows'] and tickets[live['rows'] - 1] == live['last_ticket']:
+            try:
+                # The first extension pays for one pass over the known prefix
+                accumulator = live['accumulator'] or MetricsAccumulator().update(deals_df.iloc[:live['rows']])
+                accumulator.update(deals_df.iloc[live['rows']:])
+            except ValueError:
+                accumulator = None
+        metrics = accumulator.to_dict() if accumulator else calculate_trading_metrics(deals_df)
+        _live_metrics[key] = {'rows': len(tickets), 'last_ticket': int(tickets[-1]), 'accumulator': accumulator}
+        while len(_live_metrics) > MAX_LIVE_ACCUMULATORS:
+            _live_metrics.pop(next(iter(_live_metrics)))
+    return metrics
+
+def get_trading_metrics(deals_df):
+    """Trading metrics for a deal frame, computed once per distinct dataset.
+
+    When a frame only adds deals after the previous one (a live account picking
+    up new closes), the new deals are folded into a running MetricsAccumulator
+    instead of recomputing the whole history.
+    """
+    return cached('trading_metrics', deals_df, _incremental_metrics)
+
+def get_round_trips(deals_df):
+    """Round-trip trade table (one row per position) for a deal frame, built once per distinct dataset."""
+    return cached('round_trips', deals_df, build_round_trips)
+
+def get_balance_curve(deals_df):
+    """Time-indexed (times, balance) arrays for a deal frame, built once per distinct dataset."""
+    return cached('balance_curve', deals_df, balance_curve)
+
+def get_trade_curve(deals_df):
+    """Time-indexed cumulative trading result (no deposits or withdrawals), built once per distinct dataset."""
+    return cached('trade_curve', deals_df, lambda df: balance_curve(df, trades_only=True))
+
+def get_drawdowns(deals_df):
+    """Drawdown episodes and underwater curve of the trading result, built once per distinct dataset.
+
+    Deposits and withdrawals are left out, so a withdrawal never counts as a drawdown.
+    """
+    return cached('drawdowns', deals_df, lambda df: analyze_drawdowns(*get_trade_curve(df)))
+
+def build_rolling_metrics(deals_df, kind):
+    """(x axis, {window: {metric: array}}) for one window kind, over the exit deals in time order."""
+    exit_rows = np.flatnonzero(deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT)
+    times = deals_df['time'].to_numpy().take(exit_rows)
+    profits = deals_df['profit'].to_numpy(dtype=np.float64).take(exit_rows)
+    if kind == 'days':
+        return rolling_calendar_metrics(times, profits)
+    order = np.argsort(times, kind='stable')
+    return times[order], rolling_trade_metrics(profits[order])
+
+def get_rolling_metrics(deals_df, kind):
+    """(x axis, {window: {metric: array}}) for every window of one kind ('trades' or 'days'), built once per dataset."""
+    return cached(f'rolling_{kind}', deals_df, lambda df: build_rolling_metrics(df, kind))
+
+def get_strategy_breakdown(deals_df, by):
+    """Per-group trading metrics for the given key columns, built once per dataset and grouping."""
+    return cached(f"breakdown_{'_'.join(by)}", deals_df, lambda df: strategy_breakdown(df, by))
 
 def calculate_monthly_stats(daily_stats, year, month):
     """Calculates statistics for the given month and compares to the previous one."""
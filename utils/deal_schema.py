@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# MT5 DEAL_ENTRY_* codes, kept as int8 in the deal frame
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_ENTRY_INOUT = 2
+DEAL_ENTRY_OUT_BY = 3
+# MT5 DEAL_TYPE_* codes of trades; other types are balance, credit, charge and similar deals
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+
+# Column dtypes of the dashboard deal frame. Small enums are int8 codes, repeated
+# text is categorical, and volume (lots, two decimals) fits float32; prices and
+# money stay float64 so sums match the terminal to the cent.
+DEAL_DTYPES = {
+    'ticket': np.int64,
+    'order': np.int64,
+    'time_msc': np.int64,
+    'type': np.int8,
+    'entry': np.int8,
+    'magic': np.int64,
+    'position_id': np.int64,
+    'reason': np.int8,
+    'volume': np.float32,
+    'price': np.float64,
+    'commission': np.float64,
+    'swap': np.float64,
+    'profit': np.float64,
+    'fee': np.float64,
+    'symbol': 'category',
+    'comment': 'category',
+    'external_id': 'category',
+}
+
+def apply_deal_schema(deals_df):
+    """Converts raw terminal deal columns to the compact dashboard schema in place.
+
+    time becomes datetime64 from epoch seconds; missing fee values (older
+    terminals) become zero.
+    """
+    if 'fee' in deals_df:
+        deals_df['fee'] = deals_df['fee'].fillna(0.0)
+    deals_df['time'] = pd.to_datetime(deals_df['time'], unit='s')
+    for column, dtype in DEAL_DTYPES.items():
+        if column in deals_df:
+            deals_df[column] = deals_df[column].astype(dtype)
+    return deals_df
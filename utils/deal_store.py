@@ -0,0 +1,117 @@
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from utils.mt5_backend import mt5
+import pandas as pd
+
+# Directory holding one SQLite file per login/server pair
+STORE_DIR = os.environ.get('MT5_DEAL_STORE_DIR', 'deal_store')
+
+# Column layout of MT5 TradeDeal tuples, in terminal order
+DEAL_COLUMNS = [
+    'ticket', 'order', 'time', 'time_msc', 'type', 'entry', 'magic', 'position_id',
+    'reason', 'volume', 'price', 'commission', 'swap', 'profit', 'fee',
+    'symbol', 'comment', 'external_id',
+]
+_COLUMN_TYPES = {
+    'volume': 'REAL', 'price': 'REAL', 'commission': 'REAL', 'swap': 'REAL',
+    'profit': 'REAL', 'fee': 'REAL', 'symbol': 'TEXT', 'comment': 'TEXT', 'external_id': 'TEXT',
+}
+
+# Deals are re-requested from this far before the last sync point. Deal times are in
+# server time, so the overlap has to cover any server/local clock offset; duplicates
+# are dropped on the ticket primary key.
+TAIL_OVERLAP = timedelta(days=1)
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _to_ts(dt):
+    """Converts a naive datetime to epoch seconds on the same clock as deal times."""
+    return int((dt - _EPOCH).total_seconds())
+
+def _from_ts(ts):
+    return _EPOCH + timedelta(seconds=ts)
+
+def store_path(login, server):
+    """Returns the store file for an account."""
+    safe_server = re.sub(r'[^A-Za-z0-9._-]', '_', str(server))
+    return os.path.join(STORE_DIR, f"{safe_server}_{int(login)}.sqlite")
+
+def _connect(login, server):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    conn = sqlite3.connect(store_path(login, server))
+    columns = ', '.join(
+        f'"{col}" {_COLUMN_TYPES.get(col, "INTEGER")}' + (' PRIMARY KEY' if col == 'ticket' else '')
+        for col in DEAL_COLUMNS
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS deals ({columns})")
+    conn.execute("CREATE INDEX IF NOT EXISTS deals_time ON deals (time)")
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_state (synced_from INTEGER, synced_to INTEGER)")
+    return conn
+
+def _insert_deals(conn, deals):
+    """Appends terminal deals to the store, skipping tickets already present."""
+    if deals is None or len(deals) == 0:
+        return 0
+    fields = deals[0]._fields
+    if list(fields) == DEAL_COLUMNS:
+        # Terminal tuples already match the table layout and bind directly
+        rows = deals
+    else:
+        positions = [fields.index(col) if col in fields else None for col in DEAL_COLUMNS]
+        rows = (tuple(deal[i] if i is not None else None for i in positions) for deal in deals)
+    placeholders = ', '.join('?' for _ in DEAL_COLUMNS)
+    quoted = ', '.join(f'"{col}"' for col in DEAL_COLUMNS)
+    before = conn.total_changes
+    conn.executemany(f"INSERT OR IGNORE INTO deals ({quoted}) VALUES ({placeholders})", rows)
+    return conn.total_changes - before
+
+def sync_deals(login, server, from_date, to_date):
+    """Brings the local store up to date for the requested range.
+
+    Only the parts of the range that were never synced are requested from the
+    terminal: older history when the range is widened backwards, and deals newer
+    than the last sync point at the tail. A request the terminal fails (None
+    instead of a tuple) leaves its part of the range unsynced, so the next call
+    asks for it again.
+    """
+    from_ts, to_ts = _to_ts(from_date), _to_ts(to_date)
+    now_ts = _to_ts(datetime.now())
+    conn = _connect(login, server)
+    try:
+        state = conn.execute("SELECT synced_from, synced_to FROM sync_state").fetchone()
+        if state is None:
+            deals = mt5.history_deals_get(from_date, to_date)
+            if deals is not None:
+                _insert_deals(conn, deals)
+                conn.execute("INSERT INTO sync_state VALUES (?, ?)", (from_ts, min(to_ts, now_ts)))
+        else:
+            synced_from, synced_to = state
+            if from_ts < synced_from:
+                deals = mt5.history_deals_get(from_date, _from_ts(synced_from))
+                if deals is not None:
+                    _insert_deals(conn, deals)
+                    synced_from = from_ts
+            if to_ts > synced_to:
+                tail_start = _from_ts(synced_to) - TAIL_OVERLAP
+                deals = mt5.history_deals_get(tail_start, to_date)
+                if deals is not None:
+                    _insert_deals(conn, deals)
+                    synced_to = min(to_ts, now_ts)
+            conn.execute("UPDATE sync_state SET synced_from = ?, synced_to = ?", (synced_from, synced_to))
+        conn.commit()
+    finally:
+        conn.close()
+
+def load_deals(login, server, from_date, to_date):
+    """Reads the deals in [from_date, to_date] from the local store as raw terminal columns."""
+    conn = _connect(login, server)
+    try:
+        return pd.read_sql_query(
+            "SELECT * FROM deals WHERE time BETWEEN ? AND ? ORDER BY time, ticket",
+            conn,
+            params=(_to_ts(from_date), _to_ts(to_date)),
+        )
+    finally:
+        conn.close()
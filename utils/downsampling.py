@@ -0,0 +1,75 @@
+import numpy as np
+from utils.deal_schema import DEAL_TYPE_BUY, DEAL_TYPE_SELL
+
+# Points sent to the browser per curve; enough for a full-width chart
+DEFAULT_POINT_BUDGET = 2000
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the curve's shape.
+
+    The first and last points are always kept. The interior is split into
+    threshold - 2 equal buckets and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average. Bucket averages come from cumulative sums, so the Python loop runs
+    once per output point rather than once per input point.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    buckets = threshold - 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    counts = np.diff(edges)
+    sum_x = np.r_[0.0, np.cumsum(x)]
+    sum_y = np.r_[0.0, np.cumsum(y)]
+    # Average of each bucket, followed by the last point as the final "next bucket"
+    avg_x = np.r_[(sum_x[edges[1:]] - sum_x[edges[:-1]]) / counts, x[-1]]
+    avg_y = np.r_[(sum_y[edges[1:]] - sum_y[edges[:-1]]) / counts, y[-1]]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(buckets):
+        start, end = edges[i], edges[i + 1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def balance_curve(deals_df, trades_only=False):
+    """Time-indexed balance: running sum of every deal's profit, commission, swap and fee.
+
+    Balance and credit deals (deposits, withdrawals, credit) carry their amount
+    in profit, so they move the curve alongside closed trades. With trades_only
+    they are left out and the curve is the cumulative trading result.
+    """
+    if deals_df is not None and trades_only:
+        deals_df = deals_df[np.isin(deals_df['type'].to_numpy(), (DEAL_TYPE_BUY, DEAL_TYPE_SELL))]
+    if deals_df is None or deals_df.empty:
+        return np.empty(0, dtype='datetime64[ns]'), np.empty(0)
+    times = deals_df['time'].to_numpy()
+    change = deals_df['profit'].to_numpy(dtype=np.float64).copy()
+    for column in ('commission', 'swap', 'fee'):
+        if column in deals_df:
+            change += deals_df[column].to_numpy(dtype=np.float64)
+    if not (times[1:] >= times[:-1]).all():
+        order = np.argsort(times, kind='stable')
+        times, change = times[order], change[order]
+    return times, np.cumsum(change)
+
+def downsample_series(times, values, budget=DEFAULT_POINT_BUDGET, window=None):
+    """Decimates a time series to about `budget` points, optionally within a (start, end) window.
+
+    The window is located with searchsorted and widened by one point on each
+    side so the line runs to the chart edges; only that slice is decimated, so
+    narrowing the window shows proportionally more detail.
+    """
+    if window is not None:
+        start = max(np.searchsorted(times, np.datetime64(window[0]), 'left') - 1, 0)
+        end = min(np.searchsorted(times, np.datetime64(window[1]), 'right') + 1, len(times))
+        times, values = times[start:end], values[start:end]
+    keep = lttb(times.astype('datetime64[ns]').astype(np.int64), values, budget)
+    return times[keep], values[keep]
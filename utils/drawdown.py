@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+EPISODE_COLUMNS = [
+    'peak_time', 'trough_time', 'recovery_time', 'peak_balance', 'trough_balance',
+    'depth', 'duration', 'time_to_trough', 'recovered',
+]
+
+def analyze_drawdowns(times, balance):
+    """Splits a time-sorted balance series into drawdown episodes in O(n).
+
+    An episode runs from a running peak until the balance first gets back to
+    that peak. The running peak comes from np.maximum.accumulate, episodes are
+    the runs of points below it, and each trough is the first point of the run
+    at the run's minimum. Returns {'episodes': frame sorted by depth, largest
+    first, 'underwater': balance minus running peak, 'peak': running peak}.
+    An episode still open at the end has no recovery time and its duration
+    runs to the last point. Percentages are left to the caller so the same
+    result can be anchored to different starting balances.
+    """
+    if len(balance) == 0:
+        return {'episodes': pd.DataFrame(columns=EPISODE_COLUMNS), 'underwater': np.zeros(0), 'peak': np.zeros(0)}
+    peak = np.maximum.accumulate(balance)
+    underwater = balance - peak
+    below = underwater < 0
+
+    starts = np.flatnonzero(below & ~np.r_[False, below[:-1]])
+    ends = np.flatnonzero(below & ~np.r_[below[1:], False])
+    if len(starts) == 0:
+        return {'episodes': pd.DataFrame(columns=EPISODE_COLUMNS), 'underwater': underwater, 'peak': peak}
+
+    depth = np.minimum.reduceat(underwater, starts)
+    # First point of each run that sits at the run's minimum
+    run_min = np.repeat(depth, ends - starts + 1)
+    run_rows = np.flatnonzero(below)
+    at_min = run_rows[underwater[run_rows] == run_min]
+    troughs = at_min[np.searchsorted(at_min, starts)]
+
+    # The balance is at its running peak just before every run
+    peaks = starts - 1
+    recovered = ends + 1 < len(balance)
+    recovery_rows = np.minimum(ends + 1, len(balance) - 1)
+    peak_times = times[peaks]
+    recovery_times = np.where(recovered, times[recovery_rows], np.datetime64('NaT'))
+
+    episodes = pd.DataFrame({
+        'peak_time': peak_times,
+        'trough_time': times[troughs],
+        'recovery_time': recovery_times,
+        'peak_balance': balance[peaks],
+        'trough_balance': balance[troughs],
+        'depth': -depth,
+        'duration': times[recovery_rows] - peak_times,
+        'time_to_trough': times[troughs] - peak_times,
+        'recovered': recovered,
+    })
+    episodes = episodes.sort_values('depth', ascending=False, kind='stable', ignore_index=True)
+    return {'episodes': episodes, 'underwater': underwater, 'peak': peak}
+
+def absolute_drawdown(balance, initial_balance):
+    """How far the balance fell below the starting balance (zero if it never did)."""
+    if len(balance) == 0:
+        return 0.0
+    return max(0.0, initial_balance - float(balance.min()))
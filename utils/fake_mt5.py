@@ -0,0 +1,153 @@
+# Offline stand-in for the MetaTrader5 module. Serves a seeded synthetic account so the
+# dashboard can be run, profiled and load-tested without a terminal.
+import os
+from collections import namedtuple
+from datetime import datetime
+import numpy as np
+from utils.synthetic_deals import generate_deals
+
+DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DEAL_ENTRY_INOUT, DEAL_ENTRY_OUT_BY = 0, 1, 2, 3
+DEAL_TYPE_BUY, DEAL_TYPE_SELL, DEAL_TYPE_BALANCE, DEAL_TYPE_CREDIT = 0, 1, 2, 3
+POSITION_TYPE_BUY, POSITION_TYPE_SELL = 0, 1
+
+TradeDeal = namedtuple('TradeDeal', [
+    'ticket', 'order', 'time', 'time_msc', 'type', 'entry', 'magic', 'position_id',
+    'reason', 'volume', 'price', 'commission', 'swap', 'profit', 'fee',
+    'symbol', 'comment', 'external_id',
+])
+TradePosition = namedtuple('TradePosition', [
+    'ticket', 'time', 'time_msc', 'time_update', 'time_update_msc', 'type', 'magic',
+    'identifier', 'reason', 'volume', 'price_open', 'sl', 'tp', 'price_current',
+    'swap', 'profit', 'symbol', 'comment', 'external_id',
+])
+AccountInfo = namedtuple('AccountInfo', [
+    'login', 'trade_mode', 'leverage', 'limit_orders', 'margin_so_mode', 'trade_allowed',
+    'trade_expert', 'margin_mode', 'currency_digits', 'fifo_close', 'balance', 'credit',
+    'profit', 'equity', 'margin', 'margin_free', 'margin_level', 'margin_so_call',
+    'margin_so_so', 'margin_initial', 'margin_maintenance', 'assets', 'liabilities',
+    'commission_blocked', 'name', 'server', 'currency', 'company',
+])
+
+SYNTHETIC_DEALS = int(os.environ.get('MT5_SYNTHETIC_DEALS', 10_000))
+SYNTHETIC_SEED = int(os.environ.get('MT5_SYNTHETIC_SEED', 42))
+LEVERAGE = 100
+
+_state = {'initialized': False, 'login': None, 'server': None, 'last_error': (1, 'Success')}
+_data = {}
+
+def _dataset():
+    """Generates the synthetic history of the logged-in account once per process."""
+    login = _state['login']
+    if login not in _data:
+        # Each login gets its own reproducible account; no login keeps the plain seed
+        seed = SYNTHETIC_SEED if login is None else [SYNTHETIC_SEED, login]
+        _data[login] = {
+            'deals': generate_deals(SYNTHETIC_DEALS, seed=seed),
+            'rng': np.random.default_rng(SYNTHETIC_SEED + 1),
+        }
+    return _data[login]['deals']
+
+def _set_error(code, message):
+    _state['last_error'] = (code, message)
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return int((value - datetime(1970, 1, 1)).total_seconds())
+    return int(value)
+
+def initialize(path=None, login=None, password=None, server=None, timeout=None, portable=False):
+    """Opens the (synthetic) terminal connection."""
+    _state['initialized'] = True
+    _set_error(1, 'Success')
+    if login is not None:
+        return globals()['login'](login, password=password, server=server)
+    return True
+
+def login(login, password=None, server=None, timeout=None):
+    """Logs in with any credentials once initialized."""
+    if not _state['initialized']:
+        _set_error(-10004, 'No IPC connection')
+        return False
+    _state['login'] = int(login)
+    _state['server'] = server or 'Synthetic-Server'
+    _set_error(1, 'Success')
+    return True
+
+def shutdown():
+    """Closes the connection."""
+    _state.update(initialized=False, login=None, server=None)
+    return True
+
+def last_error():
+    """Returns the (code, message) of the last call."""
+    return _state['last_error']
+
+def account_info():
+    """Returns account state derived from the synthetic history."""
+    if not _state['initialized'] or _state['login'] is None:
+        _set_error(-10004, 'No IPC connection')
+        return None
+    deals = _dataset()
+    balance = float(np.round(
+        (deals['profit'] + deals['commission'] + deals['swap'] + deals['fee']).sum(), 2))
+    positions = positions_get() or ()
+    floating = float(sum(p.profit for p in positions))
+    margin = float(sum(p.volume for p in positions) * 100_000 / LEVERAGE)
+    equity = balance + floating
+    return AccountInfo(
+        login=_state['login'], trade_mode=0, leverage=LEVERAGE, limit_orders=200,
+        margin_so_mode=0, trade_allowed=True, trade_expert=True, margin_mode=2,
+        currency_digits=2, fifo_close=False, balance=balance, credit=0.0, profit=floating,
+        equity=equity, margin=margin, margin_free=equity - margin,
+        margin_level=equity / margin * 100 if margin > 0 else 0.0,
+        margin_so_call=50.0, margin_so_so=30.0, margin_initial=0.0, margin_maintenance=0.0,
+        assets=0.0, liabilities=0.0, commission_blocked=0.0, name='Synthetic Account',
+        server=_state['server'], currency='USD', company='Synthetic Broker',
+    )
+
+def history_deals_get(date_from=None, date_to=None, group=None, ticket=None, position=None):
+    """Returns TradeDeal tuples for a time range, ticket or position."""
+    if not _state['initialized']:
+        _set_error(-10004, 'No IPC connection')
+        return None
+    deals = _dataset()
+    if ticket is not None or position is not None:
+        key, value = ('ticket', ticket) if ticket is not None else ('position_id', position)
+        rows = np.flatnonzero(deals[key] == value)
+    else:
+        lo = np.searchsorted(deals['time'], _timestamp(date_from), side='left')
+        hi = np.searchsorted(deals['time'], _timestamp(date_to), side='right')
+        rows = np.arange(lo, hi)
+    columns = [deals[field][rows].tolist() for field in TradeDeal._fields]
+    return tuple(map(TradeDeal._make, zip(*columns)))
+
+def positions_get(symbol=None, group=None, ticket=None):
+    """Returns the open positions of the synthetic account."""
+    if not _state['initialized']:
+        _set_error(-10004, 'No IPC connection')
+        return None
+    deals = _dataset()
+    rows = np.flatnonzero(deals['is_open'])
+    # Prices drift a little on every call so live views have something to show
+    drift = _data[_state['login']]['rng'].normal(0, 0.0005, size=len(rows))
+    positions = []
+    for row, change in zip(rows, drift):
+        side = int(deals['type'][row])
+        price_open = float(deals['price'][row])
+        price_current = round(price_open * (1 + change), 5)
+        direction = 1 if side == POSITION_TYPE_BUY else -1
+        profit = round(direction * (price_current - price_open) / price_open * deals['volume'][row] * 100_000, 2)
+        positions.append(TradePosition(
+            ticket=int(deals['position_id'][row]), time=int(deals['time'][row]),
+            time_msc=int(deals['time_msc'][row]), time_update=int(deals['time'][row]),
+            time_update_msc=int(deals['time_msc'][row]), type=side, magic=int(deals['magic'][row]),
+            identifier=int(deals['position_id'][row]), reason=int(deals['reason'][row]),
+            volume=float(deals['volume'][row]), price_open=price_open, sl=0.0, tp=0.0,
+            price_current=price_current, swap=0.0, profit=profit, symbol=deals['symbol'][row],
+            comment='', external_id='',
+        ))
+    if symbol is not None:
+        positions = [p for p in positions if p.symbol == symbol]
+    if ticket is not None:
+        positions = [p for p in positions if p.ticket == ticket]
+    return tuple(positions)
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from utils.mt5_backend import mt5
+
+DEFAULT_POLL_INTERVAL = float(os.environ.get('LIVE_POLL_INTERVAL', 0.5))
+
+# A subscriber that has not renewed within this many of its intervals (and at least
+# SUBSCRIBER_MIN_LEASE seconds) is treated as gone, e.g. its session left the page
+SUBSCRIBER_LEASE_INTERVALS = 3
+SUBSCRIBER_MIN_LEASE = 2.0
+
+class LivePoller:
+    """Background thread that polls open positions and account state.
+
+    Each poll is diffed against the shared snapshot and only the changed
+    positions and account fields are applied, and the snapshot records which
+    ones changed and when. The thread runs only while it has subscribers:
+    each one renews a lease on every render, polling runs at the shortest
+    interval any of them asked for, and the thread exits once every lease
+    has expired or been released.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._subscribers = {}
+        self._account = None
+        self._positions = {}
+        self._last_delta = {}
+        self._updated_at = None
+
+    def subscribe(self, subscriber, interval=DEFAULT_POLL_INTERVAL):
+        """Renews subscriber's lease at the given interval, starting the thread if it is not running."""
+        lease = max(interval * SUBSCRIBER_LEASE_INTERVALS, SUBSCRIBER_MIN_LEASE)
+        with self._lock:
+            self._subscribers[subscriber] = (interval, time.monotonic() + lease)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='mt5-live-poller', daemon=True)
+                self._thread.start()
+        return self
+
+    def unsubscribe(self, subscriber):
+        """Drops subscriber's lease; the thread stops after its last subscriber leaves."""
+        with self._lock:
+            self._subscribers.pop(subscriber, None)
+
+    def _interval(self):
+        """Shortest interval among live subscribers; clears the thread and returns None when there are none."""
+        now = time.monotonic()
+        with self._lock:
+            for subscriber, (_, expires) in list(self._subscribers.items()):
+                if expires < now:
+                    del self._subscribers[subscriber]
+            if not self._subscribers:
+                self._thread = None
+                return None
+            return min(interval for interval, _ in self._subscribers.values())
+
+    def _run(self):
+        while True:
+            interval = self._interval()
+            if interval is None:
+                return
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception:
+                # A failed poll keeps the previous snapshot; the next tick retries
+                pass
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def poll_once(self):
+        """Fetches positions and account info and applies the differences to the snapshot."""
+        positions = mt5.positions_get()
+        account = mt5.account_info()
+        if positions is None or account is None:
+            return False
+        current = {position.ticket: position for position in positions}
+
+        with self._lock:
+            added = [t for t in current if t not in self._positions]
+            removed = [t for t in self._positions if t not in current]
+            changed = [t for t, p in current.items() if t in self._positions and self._positions[t] != p]
+            account_fields = (
+                [f for f in account._fields if getattr(account, f) != getattr(self._account, f)]
+                if self._account is not None else list(account._fields)
+            )
+            if not (added or removed or changed or account_fields):
+                return False
+            for ticket in removed:
+                del self._positions[ticket]
+            for ticket in added + changed:
+                self._positions[ticket] = current[ticket]
+            self._account = account
+            self._last_delta = {'added': added, 'removed': removed, 'changed': changed, 'account': account_fields}
+            self._updated_at = time.time()
+            return True
+
+    def snapshot(self):
+        """Returns a consistent copy of the latest state."""
+        with self._lock:
+            return {
+                'account': self._account,
+                'positions': list(self._positions.values()),
+                'last_delta': dict(self._last_delta),
+                'updated_at': self._updated_at,
+            }
+
+_poller = LivePoller()
+
+def subscribe(subscriber, interval=DEFAULT_POLL_INTERVAL):
+    """Renews subscriber's lease on the process-wide poller and returns it."""
+    return _poller.subscribe(subscriber, interval)
+
+def unsubscribe(subscriber):
+    """Releases subscriber's lease on the process-wide poller, e.g. on logout."""
+    _poller.unsubscribe(subscriber)
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+# Results are shared across pages, reruns and sessions of the same process
+MAX_ENTRIES = 64
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+_stats = {}
+
+def deal_fingerprint(deals_df):
+    """Identifies a deal frame in O(1) by row count, ticket range and time range."""
+    if deals_df is None or deals_df.empty:
+        return None
+    tickets = deals_df['ticket'].to_numpy()
+    times = deals_df['time'].to_numpy()
+    return (len(deals_df), int(tickets[0]), int(tickets[-1]), times[0], times[-1])
+
+def cached(kind, deals_df, compute):
+    """Returns compute(deals_df), reusing the result for frames with the same fingerprint.
+
+    kind names the derived dataset (e.g. 'trading_metrics') so several analyses
+    can be cached for one deal frame. Cached values are shared and must be
+    treated as read-only by callers.
+    """
+    fingerprint = deal_fingerprint(deals_df)
+    if fingerprint is None:
+        return compute(deals_df)
+    key = (kind, fingerprint)
+    with _lock:
+        counters = _stats.setdefault(kind, {'hits': 0, 'misses': 0})
+        if key in _entries:
+            counters['hits'] += 1
+            _entries.move_to_end(key)
+            return _entries[key]
+        counters['misses'] += 1
+
+    value = compute(deals_df)
+    with _lock:
+        _entries[key] = value
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return value
+
+def cache_stats():
+    """Returns {kind: {'hits', 'misses'}} counters plus the number of stored entries."""
+    with _lock:
+        return {kind: dict(counters) for kind, counters in _stats.items()}, len(_entries)
+
+def clear_cache():
+    """Drops all cached results and resets the counters."""
+    with _lock:
+        _entries.clear()
+        _stats.clear()
@@ -0,0 +1,303 @@
+import numpy as np
+from utils.deal_schema import DEAL_ENTRY_OUT
+
+TRADING_DAYS_PER_YEAR = 252
+
+def _run_lengths(flags):
+    """Run-length encodes a boolean array, returning (run values, run lengths)."""
+    if len(flags) == 0:
+        return flags[:0], np.empty(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, flags[1:] != flags[:-1]])
+    lengths = np.diff(np.r_[starts, len(flags)])
+    return flags[starts], lengths
+
+def _sharpe_ratio(times, profits):
+    """Annualized Sharpe ratio of daily profit sums; times must be sorted."""
+    days = times.astype('datetime64[D]')
+    day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    if len(day_starts) < 2:
+        return 0
+    daily_returns = np.add.reduceat(profits, day_starts)
+    std = daily_returns.std(ddof=1)
+    return daily_returns.mean() / std * np.sqrt(TRADING_DAYS_PER_YEAR) if std > 0 else 0
+
+def compute_trading_metrics(times, profits, types):
+    """Computes the trading metrics dict from exit-deal arrays.
+
+    times is a datetime64 array, profits a float array and types the MT5 deal
+    types, all aligned. Every metric is a vectorized reduction over the
+    time-ordered arrays: drawdown from np.maximum.accumulate, streaks from
+    run-length encoding of the win/loss signs and Sharpe from per-day
+    reduceat sums.
+    """
+    total_trades = len(profits)
+    if total_trades == 0:
+        return {}
+
+    if not (times[1:] >= times[:-1]).all():
+        order = np.argsort(times, kind='stable')
+        times, profits, types = times[order], profits[order], types[order]
+
+    wins = profits > 0
+    losses = profits < 0
+    winning_count = int(np.count_nonzero(wins))
+    losing_count = int(np.count_nonzero(losses))
+    # Clipping keeps the sums on contiguous arrays instead of masked subsets
+    winning_sum = np.maximum(profits, 0).sum()
+    losing_sum = np.minimum(profits, 0).sum()
+
+    gross_profit = winning_sum if winning_count else 0
+    gross_loss = abs(losing_sum) if losing_count else 0
+    net_profit = gross_profit - gross_loss
+
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
+    expected_payoff = net_profit / total_trades
+    win_rate = winning_count / total_trades * 100
+
+    avg_win = winning_sum / winning_count if winning_count else 0
+    avg_loss = losing_sum / losing_count if losing_count else 0
+    largest_win = profits.max() if winning_count else 0
+    largest_loss = profits.min() if losing_count else 0
+
+    cumulative_profit = np.cumsum(profits)
+    drawdown = cumulative_profit - np.maximum.accumulate(cumulative_profit)
+    max_drawdown = abs(drawdown.min())
+    recovery_factor = net_profit / max_drawdown if max_drawdown > 0 else float('inf') if net_profit > 0 else 0
+
+    sharpe_ratio = _sharpe_ratio(times, profits)
+
+    # Break-even trades neither extend nor break a streak
+    run_is_win, run_lengths = _run_lengths(wins[wins | losses])
+    win_runs = run_lengths[run_is_win]
+    loss_runs = run_lengths[~run_is_win]
+    max_consecutive_wins = int(win_runs.max()) if len(win_runs) else 0
+    max_consecutive_losses = int(loss_runs.max()) if len(loss_runs) else 0
+    avg_consecutive_wins = win_runs.mean() if len(win_runs) else 0
+
+    shorts = types == 1  # Assuming 1 is sell
+    short_trades_total = int(np.count_nonzero(shorts))
+    short_win_rate = np.count_nonzero(shorts & wins) / short_trades_total * 100 if short_trades_total else 0
+
+    return {
+        'total_trades': total_trades,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'net_profit': net_profit,
+        'profit_factor': profit_factor,
+        'expected_payoff': expected_payoff,
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'largest_win': largest_win,
+        'largest_loss': largest_loss,
+        'max_drawdown': max_drawdown,
+        'recovery_factor': recovery_factor,
+        'sharpe_ratio': sharpe_ratio,
+        'max_consecutive_wins': max_consecutive_wins,
+        'max_consecutive_losses': max_consecutive_losses,
+        'avg_consecutive_wins': avg_consecutive_wins,
+        'short_trades_total': short_trades_total,
+        'short_win_rate': short_win_rate,
+        'cumulative_profit': cumulative_profit,
+        'winning_trades_count': winning_count,
+        'losing_trades_count': losing_count
+    }
+
+class MetricsAccumulator:
+    """Running trading metrics that absorb new exit deals in O(k).
+
+    Holds gross profit/loss sums and counts, the running cumulative profit with
+    its peak and maximum drawdown, the current and longest win/loss streaks and
+    Welford moments of daily returns. Exits must arrive in time order across
+    calls; to_dict() returns the same schema as compute_trading_metrics.
+    """
+
+    def __init__(self):
+        self.total_trades = 0
+        self.winning_count = 0
+        self.losing_count = 0
+        self.winning_sum = 0.0
+        self.losing_sum = 0.0
+        self.largest_win = -np.inf
+        self.largest_loss = np.inf
+        self.short_trades_total = 0
+        self.short_wins = 0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.last_time = None
+        # Cumulative profit curve in a doubling buffer so appends stay amortized O(k)
+        self._curve = np.empty(1024)
+        # Streak state: sign of the open run (1 win, -1 loss, 0 none) and its length
+        self.run_sign = 0
+        self.run_length = 0
+        self.max_win_run = 0
+        self.max_loss_run = 0
+        self.closed_win_runs = 0
+        self.closed_win_run_total = 0
+        # Daily returns: Welford count/mean/M2 over finished days plus the open day
+        self.day_count = 0
+        self.day_mean = 0.0
+        self.day_m2 = 0.0
+        self.open_day = None
+        self.open_day_profit = 0.0
+
+    @property
+    def cumulative_profit(self):
+        # Written slots never change and growth reallocates, so a read-only view is safe to share
+        curve = self._curve[:self.total_trades]
+        curve.flags.writeable = False
+        return curve
+
+    def update(self, deals_df):
+        """Adds the exit deals of a deal frame that continues the previous updates."""
+        if deals_df is None or deals_df.empty:
+            return self
+        exit_rows = np.flatnonzero(deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT)
+        return self.update_arrays(
+            deals_df['time'].to_numpy().take(exit_rows),
+            deals_df['profit'].to_numpy(dtype=np.float64).take(exit_rows),
+            deals_df['type'].to_numpy().take(exit_rows),
+        )
+
+    def update_arrays(self, times, profits, types):
+        """Adds aligned exit-deal arrays; raises ValueError if they predate the last update."""
+        k = len(profits)
+        if k == 0:
+            return self
+        if not (times[1:] >= times[:-1]).all():
+            order = np.argsort(times, kind='stable')
+            times, profits, types = times[order], profits[order], types[order]
+        if self.last_time is not None and times[0] < self.last_time:
+            raise ValueError("Deals older than the last update cannot be added incrementally.")
+
+        wins = profits > 0
+        losses = profits < 0
+        self.winning_count += int(np.count_nonzero(wins))
+        self.losing_count += int(np.count_nonzero(losses))
+        self.winning_sum += np.maximum(profits, 0).sum()
+        self.losing_sum += np.minimum(profits, 0).sum()
+        self.largest_win = max(self.largest_win, profits.max())
+        self.largest_loss = min(self.largest_loss, profits.min())
+        shorts = types == 1
+        self.short_trades_total += int(np.count_nonzero(shorts))
+        self.short_wins += int(np.count_nonzero(shorts & wins))
+
+        self._extend_curve(profits)
+        self._extend_streaks(wins, losses)
+        self._extend_daily(times, profits)
+        self.last_time = times[-1]
+        return self
+
+    def _extend_curve(self, profits):
+        n, k = self.total_trades, len(profits)
+        if n + k > len(self._curve):
+            grown = np.empty(max(2 * len(self._curve), n + k))
+            grown[:n] = self._curve[:n]
+            self._curve = grown
+        # Seeding the cumsum with the last value keeps it identical to one full pass
+        start = self._curve[n - 1] if n else 0.0
+        chunk = np.cumsum(np.r_[start, profits])[1:] if n else np.cumsum(profits)
+        self._curve[n:n + k] = chunk
+        peaks = np.maximum(np.maximum.accumulate(chunk), self.peak)
+        self.max_drawdown = max(self.max_drawdown, (peaks - chunk).max())
+        self.peak = peaks[-1]
+        self.total_trades = n + k
+
+    def _extend_streaks(self, wins, losses):
+        decided = wins[wins | losses]
+        if len(decided) == 0:
+            return
+        run_is_win, run_lengths = _run_lengths(decided)
+        signs = np.where(run_is_win, 1, -1)
+        run_lengths = run_lengths.copy()
+        # The first run continues the open streak when the sign matches
+        if signs[0] == self.run_sign:
+            run_lengths[0] += self.run_length
+        elif self.run_sign == 1:
+            self.closed_win_runs += 1
+            self.closed_win_run_total += self.run_length
+        # Every run except the last one is now finished
+        finished_wins = run_lengths[:-1][run_is_win[:-1]]
+        self.closed_win_runs += len(finished_wins)
+        self.closed_win_run_total += int(finished_wins.sum())
+        if run_is_win.any():
+            self.max_win_run = max(self.max_win_run, int(run_lengths[run_is_win].max()))
+        if (~run_is_win).any():
+            self.max_loss_run = max(self.max_loss_run, int(run_lengths[~run_is_win].max()))
+        self.run_sign = int(signs[-1])
+        self.run_length = int(run_lengths[-1])
+
+    def _add_days(self, values):
+        """Merges a batch of finished daily returns into the Welford moments (Chan et al.)."""
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.day_count + count
+        delta = mean - self.day_mean
+        self.day_mean += delta * count / total
+        self.day_m2 += m2 + delta ** 2 * self.day_count * count / total
+        self.day_count = total
+
+    def _extend_daily(self, times, profits):
+        days = times.astype('datetime64[D]')
+        day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        day_sums = np.add.reduceat(profits, day_starts)
+        first_day = days[day_starts[0]]
+        if self.open_day is not None and first_day == self.open_day:
+            day_sums[0] += self.open_day_profit
+        elif self.open_day is not None:
+            self._add_days(np.array([self.open_day_profit]))
+        self._add_days(day_sums[:-1])
+        self.open_day = days[day_starts[-1]]
+        self.open_day_profit = day_sums[-1]
+
+    def _sharpe_ratio(self):
+        # Fold the open day in without mutating the running moments
+        count = self.day_count + 1
+        delta = self.open_day_profit - self.day_mean
+        mean = self.day_mean + delta / count
+        m2 = self.day_m2 + delta * (self.open_day_profit - mean)
+        if count < 2:
+            return 0
+        std = np.sqrt(m2 / (count - 1))
+        return mean / std * np.sqrt(TRADING_DAYS_PER_YEAR) if std > 0 else 0
+
+    def to_dict(self):
+        """Exports the running state in the compute_trading_metrics schema."""
+        total_trades = self.total_trades
+        if total_trades == 0:
+            return {}
+        gross_profit = self.winning_sum if self.winning_count else 0
+        gross_loss = abs(self.losing_sum) if self.losing_count else 0
+        net_profit = gross_profit - gross_loss
+        max_drawdown = self.max_drawdown
+        win_runs = self.closed_win_runs + (1 if self.run_sign == 1 else 0)
+        win_run_total = self.closed_win_run_total + (self.run_length if self.run_sign == 1 else 0)
+        max_win_run = max(self.max_win_run, self.run_length if self.run_sign == 1 else 0)
+        max_loss_run = max(self.max_loss_run, self.run_length if self.run_sign == -1 else 0)
+        return {
+            'total_trades': total_trades,
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'net_profit': net_profit,
+            'profit_factor': gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0,
+            'expected_payoff': net_profit / total_trades,
+            'win_rate': self.winning_count / total_trades * 100,
+            'avg_win': self.winning_sum / self.winning_count if self.winning_count else 0,
+            'avg_loss': self.losing_sum / self.losing_count if self.losing_count else 0,
+            'largest_win': self.largest_win if self.winning_count else 0,
+            'largest_loss': self.largest_loss if self.losing_count else 0,
+            'max_drawdown': max_drawdown,
+            'recovery_factor': net_profit / max_drawdown if max_drawdown > 0 else float('inf') if net_profit > 0 else 0,
+            'sharpe_ratio': self._sharpe_ratio(),
+            'max_consecutive_wins': max_win_run,
+            'max_consecutive_losses': max_loss_run,
+            'avg_consecutive_wins': win_run_total / win_runs if win_runs else 0,
+            'short_trades_total': self.short_trades_total,
+            'short_win_rate': self.short_wins / self.short_trades_total * 100 if self.short_trades_total else 0,
+            'cumulative_profit': self.cumulative_profit,
+            'winning_trades_count': self.winning_count,
+            'losing_trades_count': self.losing_count
+        }
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Upper bound on the path matrices held at once across all workers
+MEMORY_BUDGET_MB = int(os.environ.get('MONTE_CARLO_MEMORY_MB', 512))
+MAX_WORKERS = int(os.environ.get('MONTE_CARLO_WORKERS', os.cpu_count() or 1))
+# Peak bytes per simulated trade: float32 paths and running peak, the int32 draw
+# indices and the boolean and counter matrices of the losing-streak pass
+_BYTES_PER_ELEMENT = 20
+
+def simulate_paths(profits, n_paths, seed, initial_balance=0.0, ruin_level=None, method='bootstrap'):
+    """Simulates n_paths resampled trade sequences as one 2-D block.
+
+    method 'bootstrap' draws trades with replacement; 'permute' shuffles the
+    realized trades, so every path ends at the same equity. Returns per-path
+    arrays of max drawdown, longest losing streak, final equity and whether
+    equity ever touched ruin_level.
+    """
+    rng = np.random.default_rng(seed)
+    n_trades = len(profits)
+    # float32 halves memory traffic; rounding over a few thousand trades stays in the cents
+    profits = np.asarray(profits, dtype=np.float32)
+    if method == 'permute':
+        paths = rng.permuted(np.broadcast_to(profits, (n_paths, n_trades)), axis=1)
+    else:
+        paths = profits[rng.integers(0, n_trades, size=(n_paths, n_trades), dtype=np.int32)]
+
+    # Longest losing run per row: losses counted so far minus the count at the last win.
+    # Break-even trades neither extend nor break a streak, as in the realized metrics.
+    counter = np.int16 if n_trades < 2**15 else np.int32
+    loss_count = np.cumsum(paths < 0, axis=1, dtype=counter)
+    since_win = loss_count * (paths > 0)
+    np.maximum.accumulate(since_win, axis=1, out=since_win)
+    np.subtract(loss_count, since_win, out=since_win)
+    longest_losing = since_win.max(axis=1)
+    del loss_count, since_win
+
+    equity = np.cumsum(paths, axis=1, out=paths)
+    equity += np.float32(initial_balance)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, np.float32(initial_balance), out=peak)
+    np.subtract(peak, equity, out=peak)
+    max_drawdown = peak.max(axis=1).astype(np.float64)
+    del peak
+    ruined = equity.min(axis=1) <= ruin_level if ruin_level is not None else np.zeros(n_paths, dtype=bool)
+    return {
+        'max_drawdown': max_drawdown,
+        'longest_losing_streak': longest_losing,
+        'final_equity': equity[:, -1].astype(np.float64),
+        'ruined': ruined,
+    }
+
+def _chunk_sizes(n_paths, n_trades, workers, memory_mb):
+    """Splits n_paths into chunks whose matrices fit the memory budget when `workers` run at once."""
+    per_path = n_trades * _BYTES_PER_ELEMENT
+    rows = max(1, int(memory_mb * 2**20 / workers // per_path))
+    rows = min(rows, -(-n_paths // workers))
+    sizes = [rows] * (n_paths // rows)
+    if n_paths % rows:
+        sizes.append(n_paths % rows)
+    return sizes
+
+def run_monte_carlo(profits, n_paths=10_000, method='bootstrap', initial_balance=0.0, ruin_level=None,
+                    seed=None, max_workers=MAX_WORKERS, memory_mb=MEMORY_BUDGET_MB):
+    """Runs the simulation in memory-bounded chunks, spread over a process pool.
+
+    Each chunk gets an independent child seed of one SeedSequence, so results
+    are reproducible for a given seed, chunking and worker count.
+    """
+    profits = np.ascontiguousarray(profits, dtype=np.float64)
+    if len(profits) == 0 or n_paths <= 0:
+        return None
+    workers = max(1, min(max_workers, n_paths))
+    sizes = _chunk_sizes(n_paths, len(profits), workers, memory_mb)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(profits, size, child, initial_balance, ruin_level, method) for size, child in zip(sizes, seeds)]
+
+    if workers == 1 or len(sizes) == 1:
+        chunks = [simulate_paths(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(simulate_paths, *zip(*args)))
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+def summarize(results, percentiles=(5, 50, 95)):
+    """Percentiles of each simulated distribution plus the risk of ruin in percent."""
+    summary = {
+        key: dict(zip(percentiles, np.percentile(results[key], percentiles)))
+        for key in ('max_drawdown', 'longest_losing_streak', 'final_equity')
+    }
+    summary['risk_of_ruin'] = results['ruined'].mean() * 100
+    return summary
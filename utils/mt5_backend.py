@@ -0,0 +1,55 @@
+import functools
+import importlib
+import os
+import threading
+
+# Which MetaTrader5 implementation to use: 'terminal' for the real MetaTrader5 package,
+# 'synthetic' for the offline stand-in, or the dotted path of any compatible module.
+MT5_BACKEND = os.environ.get('MT5_BACKEND', 'terminal')
+
+_BACKENDS = {
+    'terminal': 'MetaTrader5',
+    'synthetic': 'utils.fake_mt5',
+}
+
+def load_backend(name=MT5_BACKEND):
+    """Imports the MetaTrader5-compatible module selected by name."""
+    return importlib.import_module(_BACKENDS.get(name, name))
+
+class _LazyBackend:
+    """Stands in for the backend module and imports it on first attribute access.
+
+    The terminal API keeps one connection per process and is not thread-safe,
+    while Streamlit script threads and the live poller all call it, so every
+    function call goes through one process-wide lock.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._calls = {}
+        self.lock = threading.RLock()
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = load_backend(self._name)
+        value = getattr(self._module, attr)
+        if not callable(value):
+            return value
+        call = self._calls.get(attr)
+        if call is None:
+            @functools.wraps(value)
+            def call(*args, **kwargs):
+                with self.lock:
+                    return value(*args, **kwargs)
+            self._calls[attr] = call
+        return call
+
+# The terminal package (and numpy under it) loads on the first mt5.<call>, not at app start
+mt5 = _LazyBackend(MT5_BACKEND)
+
+def _reset_lock():
+    # A forked worker (multi-account fetches) may inherit the lock held by a thread it does not have
+    mt5.lock = threading.RLock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lock)
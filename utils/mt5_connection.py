@@ -1,26 +1,26 @@
-import streamlit as st
-import MetaTrader5 as mt5
+from utils.mt5_backend import mt5
 
-def initialize_mt5():
-    """Initializes connection to the MetaTrader 5 terminal."""
-    if not mt5.initialize():
-        st.error(f"MT5 initialization failed. Error code: {mt5.last_error()}")
-        st.info("Please ensure your MetaTrader 5 terminal is running.")
-        return False
-    return True
+class MT5ConnectionError(Exception):
+    """Terminal start-up or login failure; `hint` suggests what the user can check."""
+    def __init__(self, message, hint=None):
+        super().__init__(message)
+        self.hint = hint
+
+def initialize_mt5(**kwargs):
+    """Initializes connection to the MetaTrader 5 terminal; kwargs pass through to mt5.initialize."""
+    if not mt5.initialize(**kwargs):
+        raise MT5ConnectionError(f"MT5 initialization failed. Error code: {mt5.last_error()}",
+                                 "Please ensure your MetaTrader 5 terminal is running.")
 
 def authenticate_mt5(login, password, server):
-    """Authorizes a connection to an MT5 account."""
+    """Authorizes a connection to an MT5 account, shutting the terminal connection down on failure."""
     try:
-        if mt5.login(login=login, password=password, server=server):
-            st.success("Successfully logged in!")
-            return True
-        else:
-            st.error(f"Login failed. Error code: {mt5.last_error()}")
-            st.info("Please check your credentials and try again.")
-            mt5.shutdown()
-            return False
+        logged_in = mt5.login(login=login, password=password, server=server)
     except Exception as e:
-        st.error(f"Authentication error: {str(e)}")
         mt5.shutdown()
-        return False
+        raise MT5ConnectionError(f"Authentication error: {str(e)}") from e
+    if not logged_in:
+        error = mt5.last_error()
+        mt5.shutdown()
+        raise MT5ConnectionError(f"Login failed. Error code: {error}",
+                                 "Please check your credentials and try again.")
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Field dtypes of the terminal's result tuples. Fields missing from a schema (newer
+# terminal builds add some) fall back to object.
+DEAL_SCHEMA = {
+    'ticket': np.int64, 'order': np.int64, 'time': np.int64, 'time_msc': np.int64,
+    'type': np.int64, 'entry': np.int64, 'magic': np.int64, 'position_id': np.int64,
+    'reason': np.int64, 'volume': np.float64, 'price': np.float64, 'commission': np.float64,
+    'swap': np.float64, 'profit': np.float64, 'fee': np.float64,
+    'symbol': object, 'comment': object, 'external_id': object,
+}
+ORDER_SCHEMA = {
+    'ticket': np.int64, 'time_setup': np.int64, 'time_setup_msc': np.int64, 'time_done': np.int64,
+    'time_done_msc': np.int64, 'time_expiration': np.int64, 'type': np.int64, 'type_time': np.int64,
+    'type_filling': np.int64, 'state': np.int64, 'magic': np.int64, 'position_id': np.int64,
+    'position_by_id': np.int64, 'reason': np.int64, 'volume_initial': np.float64,
+    'volume_current': np.float64, 'price_open': np.float64, 'sl': np.float64, 'tp': np.float64,
+    'price_current': np.float64, 'price_stoplimit': np.float64,
+    'symbol': object, 'comment': object, 'external_id': object,
+}
+POSITION_SCHEMA = {
+    'ticket': np.int64, 'time': np.int64, 'time_msc': np.int64, 'time_update': np.int64,
+    'time_update_msc': np.int64, 'type': np.int64, 'magic': np.int64, 'identifier': np.int64,
+    'reason': np.int64, 'volume': np.float64, 'price_open': np.float64, 'sl': np.float64,
+    'tp': np.float64, 'price_current': np.float64, 'swap': np.float64, 'profit': np.float64,
+    'symbol': object, 'comment': object, 'external_id': object,
+}
+
+# Epoch-second timestamps; every *_msc field is epoch milliseconds
+_SECOND_FIELDS = {'time', 'time_setup', 'time_done', 'time_expiration', 'time_update'}
+
+def records_to_columns(records, schema, convert_times=True):
+    """Converts MT5 result tuples into {field: NumPy array} with fixed dtypes.
+
+    The tuples are parsed into one structured array in a single C-level pass,
+    so no per-row Python objects or dtype inference are involved. With
+    convert_times, second and millisecond timestamps become datetime64 columns
+    in bulk.
+    """
+    if records is None or len(records) == 0:
+        fields = tuple(schema)
+        table = np.empty(0, dtype=list(schema.items()))
+    else:
+        fields = records[0]._fields
+        table = np.array(list(records), dtype=[(field, schema.get(field, object)) for field in fields])
+    columns = {}
+    for field in fields:
+        values = table[field]
+        if convert_times and field in _SECOND_FIELDS:
+            values = values.astype('datetime64[s]')
+        elif convert_times and field.endswith('_msc'):
+            values = values.astype('datetime64[ms]')
+        columns[field] = np.ascontiguousarray(values)
+    return columns
+
+def records_to_frame(records, schema, convert_times=True):
+    """DataFrame from MT5 result tuples via records_to_columns."""
+    return pd.DataFrame(records_to_columns(records, schema, convert_times))
@@ -0,0 +1,101 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from utils.mt5_backend import mt5
+from utils.deal_store import sync_deals, load_deals
+
+# Each worker process drives one terminal; the MetaTrader5 API holds one connection per process
+# and one logged-in account per terminal
+MAX_TERMINALS = int(os.environ.get('MT5_MAX_TERMINALS', 8))
+ACCOUNTS_FILE = os.environ.get('MT5_ACCOUNTS_FILE', 'accounts.json')
+
+def check_terminal_paths(accounts):
+    """Raises ValueError unless every account names its own terminal.
+
+    The default terminal belongs to the dashboard session and the live poller;
+    logging another account in there and shutting it down would switch and
+    then disconnect them, so every account needs a separate terminal path.
+    """
+    missing = [account['name'] for account in accounts if not account.get('path')]
+    if missing:
+        raise ValueError(f"no terminal \"path\" for {', '.join(missing)}; each account needs its own terminal")
+    seen = {}
+    for account in accounts:
+        path = os.path.normcase(os.path.abspath(account['path']))
+        if path in seen:
+            raise ValueError(f"{seen[path]} and {account['name']} share the terminal {account['path']}")
+        seen[path] = account['name']
+
+def load_accounts(path=ACCOUNTS_FILE):
+    """Reads the account list: [{"login", "password", "server", "path", "name"?}, ...]."""
+    with open(path) as f:
+        accounts = json.load(f)
+    for account in accounts:
+        account['login'] = int(account['login'])
+        account.setdefault('name', f"{account['login']}@{account['server']}")
+    check_terminal_paths(accounts)
+    return accounts
+
+def to_columnar(deals_df):
+    """Packs a raw deal frame into compact per-column arrays for transfer between processes.
+
+    Numeric columns become contiguous NumPy arrays and text columns become
+    integer codes plus their distinct values, so a result pickles as a handful
+    of buffers instead of one object per cell.
+    """
+    columns = {}
+    for name in deals_df.columns:
+        values = deals_df[name]
+        if pd.api.types.is_numeric_dtype(values):
+            columns[name] = np.ascontiguousarray(values.to_numpy())
+        else:
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            columns[name] = (codes.astype(np.int32), list(uniques))
+    return columns
+
+def from_columnar(columns):
+    """Rebuilds a raw deal frame from to_columnar output."""
+    data = {}
+    for name, values in columns.items():
+        if isinstance(values, tuple):
+            codes, uniques = values
+            data[name] = pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object)).astype(object)
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+def fetch_account_history(account, from_date, to_date):
+    """Worker entry point: logs one account in, syncs its deal store and returns columnar deals."""
+    kwargs = {'path': account['path'], 'login': account['login'], 'password': account.get('password'), 'server': account['server']}
+    # Passing credentials to initialize() starts the account's own terminal and logs in
+    if not mt5.initialize(**kwargs):
+        return {'name': account['name'], 'columns': None, 'error': f"Initialization failed: {mt5.last_error()}"}
+    try:
+        # Never sync into this account's store from whatever account the terminal ended up on
+        info = mt5.account_info()
+        if info is None or info.login != account['login']:
+            found = info.login if info is not None else None
+            return {'name': account['name'], 'columns': None, 'error': f"Terminal is logged in to {found}, not {account['login']}"}
+        sync_deals(account['login'], account['server'], from_date, to_date)
+        deals_df = load_deals(account['login'], account['server'], from_date, to_date)
+        return {'name': account['name'], 'columns': to_columnar(deals_df), 'error': None}
+    except Exception as e:
+        return {'name': account['name'], 'columns': None, 'error': str(e)}
+    finally:
+        mt5.shutdown()
+
+def iter_account_histories(accounts, from_date, to_date, max_workers=MAX_TERMINALS):
+    """Fetches accounts in a process pool, yielding results as soon as each account finishes.
+
+    Every account runs in its own worker against its own terminal (see
+    check_terminal_paths, which raises ValueError otherwise), so separate
+    terminals run in parallel and the dashboard's terminal is never touched.
+    """
+    check_terminal_paths(accounts)
+    workers = max(1, min(max_workers, len(accounts)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_account_history, account, from_date, to_date) for account in accounts]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from utils.deal_store import TAIL_OVERLAP
+
+# Seconds before the open end of a window is re-synced with the terminal
+HISTORY_TTL = 300
+# Accounts whose windows are kept per process
+MAX_WINDOWS = 4
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _to_ts(dt):
+    return int((dt - _EPOCH).total_seconds())
+
+def _from_ts(ts):
+    return _EPOCH + timedelta(seconds=ts)
+
+def concat_deal_frames(frames):
+    """Concatenates deal frames in order, keeping categorical columns categorical."""
+    frames = [frame for frame in frames if not frame.empty] or frames[:1]
+    if len(frames) == 1:
+        return frames[0]
+    combined = pd.concat(frames, ignore_index=True)
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            combined[column] = union_categoricals([frame[column] for frame in frames], ignore_order=True)
+    return combined
+
+class RangeCache:
+    """Keeps the widest loaded window of each account's deals, sorted by time.
+
+    Any range inside the window is served by two searchsorted calls and a row
+    slice. Widening the range loads only the missing head or tail through
+    loader(key, from_date, to_date), which must return a time-sorted frame for
+    the inclusive range. The open end of a window (deals up to "now", less
+    TAIL_OVERLAP) is reloaded once it is older than ttl seconds, so new deals
+    still appear even when the server clock runs behind the local one.
+    """
+
+    def __init__(self, loader, ttl=HISTORY_TTL, max_windows=MAX_WINDOWS):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self._lock = threading.Lock()
+        self._windows = OrderedDict()
+
+    def _load(self, key, lo_ts, hi_ts):
+        return self.loader(key, _from_ts(lo_ts), _from_ts(hi_ts))
+
+    def get(self, key, from_date, to_date):
+        """Returns the deals of key in [from_date, to_date] as a slice of the cached window."""
+        lo_ts, hi_ts = _to_ts(from_date), _to_ts(to_date)
+        with self._lock:
+            window = self._windows.pop(key, None)
+            if window is None:
+                window = {'lo': lo_ts, 'hi': hi_ts, 'frame': self._load(key, lo_ts, hi_ts)}
+                window['fetched'], window['refreshed'] = _to_ts(datetime.now()), time.monotonic()
+            else:
+                parts = [window['frame']]
+                frame_lo = window['lo']
+                if lo_ts < window['lo']:
+                    parts.insert(0, self._load(key, lo_ts, window['lo'] - 1))
+                    window['lo'] = lo_ts
+                # A window reaching past its fetch time is only complete up to that time. The
+                # fetch time is on the local clock and deal times on the server's, so the
+                # open end is reloaded from TAIL_OVERLAP before it to cover the clock offset,
+                # but never from before the cached frame, whose head is already loaded.
+                complete_to = max(frame_lo, min(window['hi'], window['fetched'] - int(TAIL_OVERLAP.total_seconds())))
+                stale = time.monotonic() - window['refreshed'] > self.ttl
+                if hi_ts > window['hi'] or (hi_ts > complete_to and stale):
+                    # Reload from the last complete second so late deals stamped with it are kept
+                    frame = parts.pop()
+                    cut = np.searchsorted(frame['time'].to_numpy(), np.datetime64(complete_to, 's'), 'left')
+                    window['hi'] = max(hi_ts, window['hi'])
+                    window['fetched'], window['refreshed'] = _to_ts(datetime.now()), time.monotonic()
+                    parts += [frame.iloc[:cut], self._load(key, complete_to, window['hi'])]
+                if len(parts) > 1:
+                    window['frame'] = concat_deal_frames(parts)
+            self._windows[key] = window
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+
+        frame = window['frame']
+        times = frame['time'].to_numpy()
+        lo = np.searchsorted(times, np.datetime64(lo_ts, 's'), 'left')
+        hi = np.searchsorted(times, np.datetime64(hi_ts, 's'), 'right')
+        return frame.iloc[lo:hi]
+
+    def clear(self):
+        """Drops every cached window."""
+        with self._lock:
+            self._windows.clear()
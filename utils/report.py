@@ -0,0 +1,90 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from utils.data_processing import calculate_trading_metrics, build_rolling_metrics
+from utils.rollup import build_rollup, rollup
+from utils.round_trips import build_round_trips
+from utils.downsampling import balance_curve
+from utils.drawdown import analyze_drawdowns
+from utils.strategy_breakdown import BREAKDOWN_GROUPINGS, strategy_breakdown
+from utils.time_bins import build_time_bins
+
+REPORT_FORMATS = ('json', 'parquet')
+
+def _rolling_table(x_values, rolling):
+    """Flattens {window: {metric: array}} into one frame with a '<metric>_<window>' column per pair."""
+    columns = {'time': x_values}
+    for window, metrics in rolling.items():
+        for name, values in metrics.items():
+            columns[f'{name}_{window}'] = values
+    return pd.DataFrame(columns)
+
+def _time_bins_table(bins):
+    """Long symbol/weekday/hour table of the non-empty time bins."""
+    symbol, weekday, hour = np.nonzero(bins['trades'])
+    return pd.DataFrame({
+        'symbol': pd.Categorical.from_codes(symbol, categories=bins['symbols']) if bins['symbols'] else symbol,
+        'weekday': weekday,
+        'hour': hour,
+        'profit': bins['profit'][symbol, weekday, hour],
+        'trades': bins['trades'][symbol, weekday, hour],
+        'wins': bins['wins'][symbol, weekday, hour],
+    })
+
+def build_report(deals_df):
+    """Every dashboard view of one deal frame as {'metrics': dict, 'tables': {name: DataFrame}}.
+
+    The builders are called directly rather than through the metrics cache,
+    whose dataset fingerprints are not unique across accounts. Returns None
+    when the frame has no deals.
+    """
+    metrics = calculate_trading_metrics(deals_df)
+    if not metrics:
+        return None
+    metrics.pop('cumulative_profit')
+    cube = build_rollup(deals_df)
+    times, balance = balance_curve(deals_df)
+    trade_times, trade_pl = balance_curve(deals_df, trades_only=True)
+    drawdowns = analyze_drawdowns(trade_times, trade_pl)
+    metrics['drawdown_episodes'] = len(drawdowns['episodes'])
+
+    tables = {
+        'daily': rollup(cube, 'D'),
+        'monthly': rollup(cube, 'M'),
+        'round_trips': build_round_trips(deals_df),
+        'balance': pd.DataFrame({'time': times, 'balance': balance}),
+        'underwater': pd.DataFrame({'time': trade_times, 'trade_pl': trade_pl, 'underwater': drawdowns['underwater']}),
+        'drawdown_episodes': drawdowns['episodes'],
+        'time_of_day': _time_bins_table(build_time_bins(deals_df)),
+    }
+    for kind in ('trades', 'days'):
+        tables[f'rolling_{kind}'] = _rolling_table(*build_rolling_metrics(deals_df, kind))
+    for by in BREAKDOWN_GROUPINGS.values():
+        tables['by_' + '_'.join(by)] = strategy_breakdown(deals_df, by)
+    return {'metrics': metrics, 'tables': tables}
+
+def _json_value(value):
+    """Plain JSON value for a metric; infinite and NaN ratios become null."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+def write_table(table, path, fmt):
+    """Writes one frame as <path>.json (records, ISO dates) or <path>.parquet."""
+    if fmt == 'json':
+        table.to_json(f'{path}.json', orient='records', date_format='iso', date_unit='s')
+    else:
+        table.to_parquet(f'{path}.parquet', index=False)
+
+def write_report(report, directory, formats=('json',)):
+    """Writes metrics.json plus every report table in each of the given formats under directory."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'metrics.json'), 'w') as f:
+        json.dump({name: _json_value(value) for name, value in report['metrics'].items()}, f, indent=2)
+    for name, table in report['tables'].items():
+        for fmt in formats:
+            write_table(table, os.path.join(directory, name), fmt)
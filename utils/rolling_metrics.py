@@ -0,0 +1,111 @@
+import numpy as np
+from utils.metrics_engine import TRADING_DAYS_PER_YEAR
+
+# Window sizes computed together for each window kind
+ROLLING_WINDOWS = {
+    'trades': (20, 50, 100, 250, 500),
+    'days': (7, 30, 90, 180),
+}
+ROLLING_METRICS = ('sharpe', 'win_rate', 'profit_factor', 'expectancy', 'drawdown')
+
+def sliding_max(values, window):
+    """Maximum of every `window` consecutive values in O(n) (van Herk/Gil-Werman).
+
+    The series is cut into blocks of `window`; each window spans the suffix of
+    one block and the prefix of the next, so its maximum is the larger of a
+    block-suffix maximum and a block-prefix maximum. Entries before the first
+    full window are NaN.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window > n:
+        return out
+    if window <= 1:
+        out[:] = values
+        return out
+    blocks = np.r_[values, np.full((-n) % window, -np.inf)].reshape(-1, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    ends = np.arange(window - 1, n)
+    out[window - 1:] = np.maximum(suffix[ends - window + 1], prefix[ends])
+    return out
+
+def _rolling_windows(units, windows, annualization):
+    """Rolling metrics over fixed windows of units (trades or calendar days).
+
+    units holds per-unit arrays: 'profit', 'active' (units that count towards
+    Sharpe), 'trades', 'wins', 'gross_win' and 'gross_loss'. Every window sum
+    is a difference of two prefix sums, built once and shared by all window
+    sizes.
+    """
+    prefix = {name: np.r_[0.0, np.cumsum(values, dtype=np.float64)] for name, values in units.items()}
+    prefix['profit_sq'] = np.r_[0.0, np.cumsum(np.square(units['profit'], dtype=np.float64))]
+    equity = prefix['profit'][1:]
+    n = len(equity)
+
+    results = {}
+    for window in windows:
+        out = {name: np.full(n, np.nan) for name in ROLLING_METRICS}
+        if window <= n:
+            end = np.arange(window, n + 1)
+            def total(name):
+                return prefix[name][end] - prefix[name][end - window]
+            profit, active, trades = total('profit'), total('active'), total('trades')
+            gross_win, gross_loss = total('gross_win'), -total('gross_loss')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = profit / active
+                variance = (total('profit_sq') - profit * mean) / (active - 1)
+                std = np.sqrt(np.maximum(variance, 0))
+                out['sharpe'][window - 1:] = np.where((active > 1) & (std > 0), mean / std * annualization, 0.0)
+                out['win_rate'][window - 1:] = np.where(trades > 0, total('wins') / trades * 100, np.nan)
+                out['profit_factor'][window - 1:] = np.where(gross_loss > 0, gross_win / gross_loss, np.nan)
+                out['expectancy'][window - 1:] = np.where(trades > 0, profit / trades, np.nan)
+            out['drawdown'] = equity - sliding_max(equity, window)
+        results[window] = out
+    return results
+
+def rolling_trade_metrics(profits, windows=ROLLING_WINDOWS['trades']):
+    """Rolling metrics over the last N trades for each N in windows.
+
+    Sharpe here is per trade (mean over standard deviation of trade P&L, not
+    annualized). Drawdown is the distance below the highest cumulative profit
+    inside the window.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    units = {
+        'profit': profits,
+        'active': np.ones(len(profits)),
+        'trades': np.ones(len(profits)),
+        'wins': profits > 0,
+        'gross_win': np.maximum(profits, 0),
+        'gross_loss': np.minimum(profits, 0),
+    }
+    return _rolling_windows(units, windows, 1.0)
+
+def rolling_calendar_metrics(times, profits, windows=ROLLING_WINDOWS['days']):
+    """Rolling metrics over the last N calendar days for each N in windows.
+
+    Trades are binned into a dense day axis with bincount, so day windows have
+    a fixed length. Sharpe is annualized from the daily P&L of days with
+    exits, matching the whole-period ratio. Returns (days, {window: metrics}).
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    days = np.asarray(times).astype('datetime64[D]')
+    if len(days) == 0:
+        return days, {window: {name: np.zeros(0) for name in ROLLING_METRICS} for window in windows}
+    first = days.min()
+    offsets = (days - first).astype(np.int64)
+    length = int(offsets.max()) + 1
+    def per_day(weights=None):
+        return np.bincount(offsets, weights=weights, minlength=length)
+    trades = per_day()
+    units = {
+        'profit': per_day(profits),
+        'active': (trades > 0).astype(np.float64),
+        'trades': trades,
+        'wins': per_day((profits > 0).astype(np.float64)),
+        'gross_win': per_day(np.maximum(profits, 0)),
+        'gross_loss': per_day(np.minimum(profits, 0)),
+    }
+    calendar = first + np.arange(length)
+    return calendar, _rolling_windows(units, windows, np.sqrt(TRADING_DAYS_PER_YEAR))
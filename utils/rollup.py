@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from utils.deal_schema import DEAL_ENTRY_OUT
+
+# Dimensions of the cube; type is the exit deal type (0 buy, 1 sell) as used by short_trades_total
+ROLLUP_KEYS = ['day', 'symbol', 'magic', 'type']
+_MEASURES = {
+    'profit': 'sum',
+    'trades': 'sum',
+    'wins': 'sum',
+    'losses': 'sum',
+    'win_sum': 'sum',
+    'loss_sum': 'sum',
+    'max_profit': 'max',
+    'min_profit': 'min',
+}
+
+def build_rollup(deals_df):
+    """Aggregates exit deals into a day x symbol x magic x type cube in one groupby pass.
+
+    Each cell holds the profit sum, trade count, win and loss counts, the
+    winning and losing profit sums and the largest and smallest profit, all of
+    which combine exactly when cells are merged into coarser views.
+    """
+    columns = ROLLUP_KEYS + list(_MEASURES)
+    if deals_df is None or deals_df.empty:
+        return pd.DataFrame(columns=columns)
+    exits = deals_df[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT]
+    profit = exits['profit'].to_numpy(dtype=np.float64)
+    frame = pd.DataFrame({
+        'day': exits['time'].to_numpy().astype('datetime64[D]'),
+        'symbol': exits['symbol'].array if 'symbol' in exits else '',
+        'magic': exits['magic'].to_numpy() if 'magic' in exits else 0,
+        'type': exits['type'].to_numpy(),
+        'profit': profit,
+        'wins': profit > 0,
+        'losses': profit < 0,
+        'win_sum': np.maximum(profit, 0),
+        'loss_sum': np.minimum(profit, 0),
+    })
+    cube = frame.groupby(ROLLUP_KEYS, sort=True, dropna=False, observed=True).agg(
+        profit=('profit', 'sum'),
+        trades=('profit', 'size'),
+        wins=('wins', 'sum'),
+        losses=('losses', 'sum'),
+        win_sum=('win_sum', 'sum'),
+        loss_sum=('loss_sum', 'sum'),
+        max_profit=('profit', 'max'),
+        min_profit=('profit', 'min'),
+    ).reset_index()
+    return cube[columns]
+
+def _period_start(days, period):
+    """Maps cube days to the first day of their day ('D'), Monday-based week ('W') or month ('M')."""
+    days = days.to_numpy().astype('datetime64[D]')
+    if period == 'W':
+        # 1970-01-01 was a Thursday, so Monday-based weekday is (days + 3) % 7
+        return days - (days.astype(np.int64) + 3) % 7
+    if period == 'M':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    return days
+
+def rollup(cube, period='D', by=()):
+    """Merges cube cells into totals per period ('D', 'W', 'M' or None) and any extra dimensions in by.
+
+    Returns the measures plus a 'period' column (first day of each period)
+    when a period is given. The cube is small compared with the deals, so
+    coarser views never rescan the history.
+    """
+    by = list(by)
+    if cube.empty:
+        return pd.DataFrame(columns=(['period'] if period else []) + by + list(_MEASURES))
+    keys = [cube[column] for column in by]
+    if period:
+        keys.insert(0, pd.Series(_period_start(cube['day'], period), index=cube.index, name='period'))
+    if not keys:
+        return pd.DataFrame({column: [cube[column].agg(how)] for column, how in _MEASURES.items()})
+    return cube.groupby(keys, sort=True, dropna=False, observed=True).agg(_MEASURES).reset_index()
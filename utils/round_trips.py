@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from utils.deal_schema import DEAL_ENTRY_IN, DEAL_ENTRY_OUT
+
+ROUND_TRIP_COLUMNS = [
+    'position_id', 'symbol', 'side', 'open_time', 'close_time', 'hold_time',
+    'volume', 'closed_volume', 'open_price', 'close_price', 'exits',
+    'profit', 'net_profit', 'is_closed',
+]
+
+def _group_bounds(keys, groups):
+    """Start and end offsets of each group value inside sorted keys (empty when absent)."""
+    return np.searchsorted(keys, groups, 'left'), np.searchsorted(keys, groups, 'right')
+
+def _segment_sum(values, starts, ends):
+    """Sums values[starts[i]:ends[i]] for every i via one cumulative sum."""
+    totals = np.r_[0.0, np.cumsum(values, dtype=np.float64)]
+    return totals[ends] - totals[starts]
+
+def build_round_trips(deals_df):
+    """Joins entry and exit deals on position_id into one row per round-trip trade.
+
+    Trade deals are sorted by (position_id, time) once, after which every
+    position is a contiguous segment located with searchsorted. Entries and
+    exits are sorted the same way, so each position's first entry and last
+    exit are also found with searchsorted, and volumes, prices and P&L are
+    segment sums over cumulative arrays. Partial closes count as one trade with
+    several exits; positions opened before the loaded range get no open time.
+    Only positions with at least one exit are listed.
+    """
+    if deals_df is None or deals_df.empty:
+        return pd.DataFrame(columns=ROUND_TRIP_COLUMNS)
+
+    entry = deals_df['entry'].to_numpy()
+    is_entry = entry == DEAL_ENTRY_IN
+    is_exit = entry == DEAL_ENTRY_OUT
+    rows = np.flatnonzero(is_entry | is_exit)
+    position = deals_df['position_id'].to_numpy().take(rows)
+    time = deals_df['time'].to_numpy().take(rows)
+    order = np.lexsort((time, position))
+    rows, position, time = rows[order], position[order], time[order]
+    is_entry, is_exit = is_entry[rows], is_exit[rows]
+
+    # position is sorted, so distinct exit positions are where the value changes
+    exit_positions = position[is_exit]
+    exit_positions = exit_positions[np.r_[True, exit_positions[1:] != exit_positions[:-1]]]
+    if len(exit_positions) == 0:
+        return pd.DataFrame(columns=ROUND_TRIP_COLUMNS)
+    starts, ends = _group_bounds(position, exit_positions)
+
+    volume = deals_df['volume'].to_numpy(dtype=np.float64).take(rows)
+    price = deals_df['price'].to_numpy(dtype=np.float64).take(rows)
+    profit = deals_df['profit'].to_numpy(dtype=np.float64).take(rows)
+    costs = sum(
+        deals_df[column].to_numpy(dtype=np.float64).take(rows)
+        for column in ('commission', 'swap', 'fee') if column in deals_df
+    )
+
+    entry_volume = _segment_sum(np.where(is_entry, volume, 0), starts, ends)
+    exit_volume = _segment_sum(np.where(is_exit, volume, 0), starts, ends)
+    entry_notional = _segment_sum(np.where(is_entry, volume * price, 0), starts, ends)
+    exit_notional = _segment_sum(np.where(is_exit, volume * price, 0), starts, ends)
+    exits = _segment_sum(is_exit, starts, ends).astype(np.int64)
+    gross = _segment_sum(profit, starts, ends)
+    net = gross + _segment_sum(costs, starts, ends)
+
+    # First entry and last exit per position: both subsets keep the (position, time) order
+    entry_index = np.flatnonzero(is_entry)
+    first_entry, entry_end = _group_bounds(position[entry_index], exit_positions)
+    has_entry = entry_end > first_entry
+    first_row = entry_index.take(first_entry, mode='clip') if len(entry_index) else starts
+    exit_index = np.flatnonzero(is_exit)
+    last_row = exit_index[np.searchsorted(position[exit_index], exit_positions, 'right') - 1]
+
+    types = deals_df['type'].to_numpy().take(rows)
+    open_time = np.where(has_entry, time[first_row], np.datetime64('NaT'))
+    close_time = time[last_row]
+    # An exit deal trades against the position, so its type is the opposite side
+    side_is_buy = np.where(has_entry, types[first_row] == 0, types[last_row] == 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        open_price = np.where(entry_volume > 0, entry_notional / entry_volume, np.nan)
+        close_price = np.where(exit_volume > 0, exit_notional / exit_volume, np.nan)
+
+    trips = pd.DataFrame({
+        'position_id': exit_positions,
+        'symbol': deals_df['symbol'].take(rows[starts]).array if 'symbol' in deals_df else '',
+        'side': pd.Categorical.from_codes((~side_is_buy).astype(np.int8), ['Buy', 'Sell']),
+        'open_time': open_time,
+        'close_time': close_time,
+        'hold_time': close_time - open_time,
+        'volume': np.where(has_entry, entry_volume, exit_volume),
+        'closed_volume': exit_volume,
+        'open_price': open_price,
+        'close_price': close_price,
+        'exits': exits,
+        'profit': gross,
+        'net_profit': net,
+        'is_closed': ~has_entry | (exit_volume >= entry_volume - 1e-9),
+    })
+    return trips.sort_values('close_time', kind='stable', ignore_index=True)
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from utils.deal_schema import DEAL_ENTRY_OUT
+from utils.metrics_engine import TRADING_DAYS_PER_YEAR
+
+BREAKDOWN_GROUPINGS = {
+    'Symbol': ('symbol',),
+    'Magic Number': ('magic',),
+    'Symbol × Magic': ('symbol', 'magic'),
+}
+
+def _segment_starts(*keys):
+    """Row offsets where any of the (sorted) key arrays changes value."""
+    change = np.zeros(len(keys[0]), dtype=bool)
+    change[0] = True
+    for key in keys:
+        change[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(change)
+
+def _max_drawdowns(profits, group, starts):
+    """Largest peak-to-trough fall of each group's cumulative profit in one accumulate pass.
+
+    Each group's curve is lifted by a group-sized offset larger than any swing,
+    so a running maximum over the whole array never carries a peak from one
+    group into the next.
+    """
+    cumulative = np.cumsum(profits)
+    before = np.r_[0.0, cumulative][starts]
+    curve = cumulative - before[group]
+    lift = 2 * np.abs(curve).max() + 1
+    lifted = curve + group * lift
+    drawdown = lifted - np.maximum.accumulate(lifted)
+    return -np.minimum.reduceat(drawdown, starts)
+
+def _sharpe_ratios(days, profits, group, starts, n_groups):
+    """Annualized Sharpe of each group's daily profit sums, from per-(group, day) segments."""
+    day_starts = _segment_starts(group, days)
+    daily = np.add.reduceat(profits, day_starts)
+    day_group = group[day_starts]
+    count = np.bincount(day_group, minlength=n_groups)
+    total = np.bincount(day_group, weights=daily, minlength=n_groups)
+    squares = np.bincount(day_group, weights=daily * daily, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        std = np.sqrt(np.maximum((squares - total * mean) / (count - 1), 0))
+        sharpe = mean / std * np.sqrt(TRADING_DAYS_PER_YEAR)
+    return np.where((count >= 2) & (std > 0), sharpe, 0.0)
+
+def _streaks(profits, group, n_groups):
+    """Max win run, max loss run and mean win run per group; break-even trades are skipped."""
+    decided = np.flatnonzero(profits != 0)
+    wins = profits[decided] > 0
+    run_group = group[decided]
+    max_wins = np.zeros(n_groups, dtype=np.int64)
+    max_losses = np.zeros(n_groups, dtype=np.int64)
+    avg_wins = np.zeros(n_groups)
+    if len(decided) == 0:
+        return max_wins, max_losses, avg_wins
+    run_starts = _segment_starts(run_group, wins)
+    lengths = np.diff(np.r_[run_starts, len(decided)])
+    is_win, owner = wins[run_starts], run_group[run_starts]
+    np.maximum.at(max_wins, owner[is_win], lengths[is_win])
+    np.maximum.at(max_losses, owner[~is_win], lengths[~is_win])
+    win_runs = np.bincount(owner[is_win], minlength=n_groups)
+    win_total = np.bincount(owner[is_win], weights=lengths[is_win], minlength=n_groups)
+    np.divide(win_total, win_runs, out=avg_wins, where=win_runs > 0)
+    return max_wins, max_losses, avg_wins
+
+def strategy_breakdown(deals_df, by=('symbol',)):
+    """The trading metrics set for every group of exit deals, from one sort and segmented reductions.
+
+    Exit deals are sorted once by (group, time); every group is then a
+    contiguous segment and each metric is a reduceat/bincount over all groups
+    at once. Metric names and definitions follow compute_trading_metrics.
+    """
+    by = list(by)
+    if deals_df is None or deals_df.empty:
+        return pd.DataFrame(columns=by)
+    exits = deals_df[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT]
+    if exits.empty:
+        return pd.DataFrame(columns=by)
+
+    codes, keys = pd.MultiIndex.from_frame(exits[by]).factorize() if len(by) > 1 else pd.factorize(exits[by[0]])
+    times = exits['time'].to_numpy()
+    order = np.lexsort((times, codes))
+    # factorize codes are dense, so after sorting segment i holds group i (keys[i])
+    group, times = codes[order], times[order]
+    profits = exits['profit'].to_numpy(dtype=np.float64)[order]
+    shorts = exits['type'].to_numpy()[order] == 1
+    starts = _segment_starts(group)
+    n_groups = len(starts)
+
+    wins, losses = profits > 0, profits < 0
+    total_trades = np.diff(np.r_[starts, len(profits)])
+    winning_count = np.add.reduceat(wins, starts)
+    losing_count = np.add.reduceat(losses, starts)
+    gross_profit = np.add.reduceat(np.maximum(profits, 0), starts)
+    gross_loss = -np.add.reduceat(np.minimum(profits, 0), starts)
+    net_profit = gross_profit - gross_loss
+    max_drawdown = _max_drawdowns(profits, group, starts)
+    short_total = np.add.reduceat(shorts, starts)
+    short_wins = np.add.reduceat(shorts & wins, starts)
+    max_wins, max_losses, avg_wins = _streaks(profits, group, n_groups)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        breakdown = pd.DataFrame({
+            'total_trades': total_trades,
+            'net_profit': net_profit,
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'profit_factor': np.where(gross_loss > 0, gross_profit / gross_loss, np.where(gross_profit > 0, np.inf, 0.0)),
+            'expected_payoff': net_profit / total_trades,
+            'win_rate': winning_count / total_trades * 100,
+            'avg_win': np.where(winning_count > 0, gross_profit / winning_count, 0.0),
+            'avg_loss': np.where(losing_count > 0, -gross_loss / losing_count, 0.0),
+            'largest_win': np.where(winning_count > 0, np.maximum.reduceat(profits, starts), 0.0),
+            'largest_loss': np.where(losing_count > 0, np.minimum.reduceat(profits, starts), 0.0),
+            'max_drawdown': max_drawdown,
+            'recovery_factor': np.where(max_drawdown > 0, net_profit / max_drawdown, np.where(net_profit > 0, np.inf, 0.0)),
+            'sharpe_ratio': _sharpe_ratios(times.astype('datetime64[D]'), profits, group, starts, n_groups),
+            'max_consecutive_wins': max_wins,
+            'max_consecutive_losses': max_losses,
+            'avg_consecutive_wins': avg_wins,
+            'short_trades_total': short_total,
+            'short_win_rate': np.where(short_total > 0, short_wins / short_total * 100, 0.0),
+            'winning_trades_count': winning_count,
+            'losing_trades_count': losing_count,
+        })
+    key_frame = keys.to_frame(index=False) if isinstance(keys, pd.MultiIndex) else pd.DataFrame({by[0]: keys})
+    key_frame.columns = by
+    return pd.concat([key_frame, breakdown], axis=1).sort_values('net_profit', ascending=False, ignore_index=True)
@@ -0,0 +1,98 @@
+import os
+from datetime import datetime, timedelta
+import numpy as np
+
+# symbol -> (typical price, P/L volatility per lot, relative weight)
+SYMBOLS = {
+    'EURUSD': (1.09, 60.0, 0.24),
+    'GBPUSD': (1.27, 75.0, 0.14),
+    'USDJPY': (148.5, 70.0, 0.12),
+    'AUDUSD': (0.66, 50.0, 0.07),
+    'USDCAD': (1.35, 55.0, 0.06),
+    'XAUUSD': (2050.0, 250.0, 0.17),
+    'US30': (38500.0, 180.0, 0.08),
+    'NAS100': (17800.0, 160.0, 0.07),
+    'BTCUSD': (52000.0, 400.0, 0.05),
+}
+MAGIC_NUMBERS = np.array([0, 1001, 2002, 3003, 4004])
+LOT_SIZES = np.array([0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0])
+EXIT_COMMENTS = np.array(['', '[sl]', '[tp]', 'so'], dtype=object)
+
+OPEN_POSITIONS = 5
+COMMISSION_PER_LOT = 3.5
+WIN_PROBABILITY = 0.53
+# Time of the last generated deal. Fixed (not "now") so a seed always yields the same deals:
+# tickets are positional, and a persistent deal store would otherwise keep stale times under them.
+SYNTHETIC_END = datetime.fromisoformat(os.environ.get('MT5_SYNTHETIC_END', '2026-01-01T00:00:00'))
+
+def generate_deals(n_deals, seed=42, end=None, days=730, initial_balance=10_000.0):
+    """Generates a reproducible MT5-style deal history as columnar NumPy arrays.
+
+    The history starts with a balance deposit, followed by entry/exit deal pairs
+    sharing a position_id and a few entry deals whose positions are still open.
+    Columns follow the MT5 TradeDeal layout and are sorted by time. The history
+    ends at `end`, SYNTHETIC_END by default.
+    """
+    rng = np.random.default_rng(seed)
+    end = end or SYNTHETIC_END
+    end_ts = int((end - datetime(1970, 1, 1)).total_seconds())
+    start_ts = end_ts - int(timedelta(days=days).total_seconds())
+
+    n_closed = max(0, (n_deals - 1 - OPEN_POSITIONS) // 2)
+    n_open = max(0, n_deals - 1 - 2 * n_closed)
+    n_positions = n_closed + n_open
+
+    names = list(SYMBOLS)
+    prices = np.array([SYMBOLS[s][0] for s in names])
+    volatility = np.array([SYMBOLS[s][1] for s in names])
+    weights = np.array([SYMBOLS[s][2] for s in names])
+    symbol_idx = rng.choice(len(names), size=n_positions, p=weights / weights.sum())
+
+    side = rng.integers(0, 2, size=n_positions)
+    volume = rng.choice(LOT_SIZES, size=n_positions, p=[0.2, 0.15, 0.2, 0.2, 0.12, 0.08, 0.05])
+    magic = rng.choice(MAGIC_NUMBERS, size=n_positions)
+    hold = rng.exponential(3 * 3600, size=n_positions).astype(np.int64) + 1
+    hold[:n_closed] = np.minimum(hold[:n_closed], end_ts - start_ts - 2)
+    # Closed positions must also close inside the window
+    open_time = rng.integers(start_ts + 1, end_ts - np.where(np.arange(n_positions) < n_closed, hold, 0))
+    close_time = open_time + hold
+
+    # Per-lot outcomes: slightly more winners, losers a bit larger on average
+    won = rng.random(n_closed) < WIN_PROBABILITY
+    magnitude = rng.gamma(2.0, 0.5, size=n_closed) * volatility[symbol_idx[:n_closed]]
+    profit = np.round(np.where(won, magnitude, -1.1 * magnitude) * volume[:n_closed], 2)
+    commission = np.round(-COMMISSION_PER_LOT * volume, 2)
+    swap = np.round(np.where(hold[:n_closed] > 86_400, rng.normal(-1.0, 2.0, n_closed) * volume[:n_closed], 0.0), 2)
+
+    entry_price = prices[symbol_idx] * (1 + rng.normal(0, 0.03, size=n_positions))
+    move = np.sign(profit) * np.abs(rng.normal(0, 0.004, size=n_closed))
+    exit_price = entry_price[:n_closed] * (1 + np.where(side[:n_closed] == 0, move, -move))
+
+    position_id = np.arange(n_positions, dtype=np.int64) + 10_000_000
+    n_total = 1 + n_positions + n_closed
+    columns = {
+        'time': np.concatenate([[start_ts], open_time, close_time[:n_closed]]),
+        'type': np.concatenate([[2], side, 1 - side[:n_closed]]),
+        'entry': np.concatenate([[0], np.zeros(n_positions, np.int64), np.ones(n_closed, np.int64)]),
+        'magic': np.concatenate([[0], magic, magic[:n_closed]]),
+        'position_id': np.concatenate([[0], position_id, position_id[:n_closed]]),
+        'reason': np.concatenate([[0], np.where(magic > 0, 3, 0), np.where(magic[:n_closed] > 0, 3, 0)]),
+        'volume': np.concatenate([[0.0], volume, volume[:n_closed]]),
+        'price': np.round(np.concatenate([[0.0], entry_price, exit_price]), 5),
+        'commission': np.concatenate([[0.0], commission, commission[:n_closed]]),
+        'swap': np.concatenate([[0.0], np.zeros(n_positions), swap]),
+        'profit': np.concatenate([[initial_balance], np.zeros(n_positions), profit]),
+        'fee': np.zeros(n_total),
+        'symbol': np.concatenate([[''], np.array(names, dtype=object)[symbol_idx], np.array(names, dtype=object)[symbol_idx[:n_closed]]]),
+        'comment': np.concatenate([['deposit'], np.full(n_positions, '', dtype=object), EXIT_COMMENTS[rng.integers(0, len(EXIT_COMMENTS), n_closed)]]),
+    }
+
+    order = np.argsort(columns['time'], kind='stable')
+    deals = {name: values[order] for name, values in columns.items()}
+    deals['ticket'] = np.arange(n_total, dtype=np.int64) + 1_000_000
+    deals['order'] = deals['ticket'] + 500_000
+    deals['time_msc'] = deals['time'] * 1000 + rng.integers(0, 1000, size=n_total)
+    deals['external_id'] = np.full(n_total, '', dtype=object)
+    # Rows that belong to still-open positions, for positions_get()
+    deals['is_open'] = np.isin(deals['position_id'], position_id[n_closed:])
+    return deals
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from utils.deal_schema import DEAL_ENTRY_OUT
+
+HOURS_PER_WEEK = 7 * 24
+# Session hours in UTC, [open, close); sessions overlap
+TRADING_SESSIONS = {
+    'Asia': (0, 9),
+    'London': (7, 16),
+    'New York': (12, 21),
+}
+
+def build_time_bins(deals_df):
+    """Bins exit deals by symbol x weekday x hour with one integer bincount per measure.
+
+    Returns {'symbols': list, 'profit', 'trades', 'wins'} where each measure is
+    a (symbols, 7, 24) array indexed by Monday-based weekday and hour of the
+    deal time. Any symbol subset is then a sum over the first axis.
+    """
+    empty = np.zeros((0, 7, 24))
+    if deals_df is None or deals_df.empty:
+        return {'symbols': [], 'profit': empty, 'trades': empty.astype(np.int64), 'wins': empty.astype(np.int64)}
+    exits = deals_df[deals_df['entry'].to_numpy() == DEAL_ENTRY_OUT]
+    codes, symbols = pd.factorize(exits['symbol'], sort=True)
+    hours = exits['time'].to_numpy().astype('datetime64[h]').astype(np.int64)
+    # 1970-01-01 was a Thursday, so Monday-based weekday is (days + 3) % 7
+    week_hour = (hours + 3 * 24) % HOURS_PER_WEEK
+    keys = codes.astype(np.int64) * HOURS_PER_WEEK + week_hour
+    size = len(symbols) * HOURS_PER_WEEK
+    profit = exits['profit'].to_numpy(dtype=np.float64)
+    shape = (len(symbols), 7, 24)
+    return {
+        'symbols': list(symbols),
+        'profit': np.bincount(keys, weights=profit, minlength=size).reshape(shape),
+        'trades': np.bincount(keys, minlength=size).reshape(shape),
+        'wins': np.bincount(keys[profit > 0], minlength=size).reshape(shape),
+    }
+
+def slice_time_bins(bins, symbols=None, utc_offset=0):
+    """(profit, trades, wins) 7x24 grids for a symbol subset (all when None).
+
+    utc_offset is the hours the deal times run ahead of UTC; the grids are
+    rolled back by it across the week so rows and columns are UTC weekday and hour.
+    """
+    if symbols is None:
+        rows = slice(None)
+    else:
+        wanted = set(symbols)
+        rows = [i for i, symbol in enumerate(bins['symbols']) if symbol in wanted]
+    grids = []
+    for measure in ('profit', 'trades', 'wins'):
+        grid = bins[measure][rows].sum(axis=0) if len(bins['symbols']) else np.zeros((7, 24), dtype=bins[measure].dtype)
+        grids.append(np.roll(grid.ravel(), -utc_offset).reshape(7, 24))
+    return tuple(grids)
+
+def session_totals(profit, trades, wins, sessions=TRADING_SESSIONS):
+    """Weekday x session profit, trade and win totals from 7x24 UTC grids.
+
+    Returns {session: (profit, trades, wins)} with one value per weekday.
+    A trade in an overlap counts towards every session open at that hour.
+    """
+    totals = {}
+    for name, (open_hour, close_hour) in sessions.items():
+        hours = slice(open_hour, close_hour)
+        totals[name] = (profit[:, hours].sum(axis=1), trades[:, hours].sum(axis=1), wins[:, hours].sum(axis=1))
+    return totals